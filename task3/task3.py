@@ -8,6 +8,8 @@
 Використання:
     python task3.py /path/to/logfile.log
     python task3.py /path/to/logfile.log ERROR
+    python task3.py /path/to/logfile.log --stats
+    python task3.py /path/to/logfile.log --profile profile.out
 
 Функціональне програмування:
     - Використання lambda-функцій
@@ -17,13 +19,124 @@
 """
 
 import sys
+import os
 import re
+import time
 import argparse
+import contextlib
+import itertools
 from pathlib import Path
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Iterator
 from collections import defaultdict
 
 
+# -------------------- Інструментування --------------------
+
+class PipelineStats:
+    """
+    Збирає статистику виконання аналізатора за етапами.
+    
+    Для кожного етапу (читання, парсинг, фільтрація, вивід) зберігається
+    реальний час (wall time) та процесорний час (CPU time). Етап може
+    виконуватися кілька разів (файл читається та парситься порціями),
+    час при цьому підсумовується. Додатково рахуються прочитані рядки
+    та байти, порожні рядки, рядки, що не пройшли парсинг, і пікова
+    пам'ять процесу (RSS).
+    
+    Якщо статистика вимкнена, замість об'єкта передається None і жоден
+    вимір не виконується.
+    """
+    
+    def __init__(self) -> None:
+        self.stages: Dict[str, List[float]] = {}
+        self.lines = 0
+        self.bytes = 0
+        self.blank_lines = 0
+        self.parse_failures = 0
+        self.peak_memory: Optional[int] = None
+    
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Вимірює wall time та CPU time блоку коду під іменем етапу.
+        
+        Args:
+            name (str): Назва етапу
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            totals = self.stages.setdefault(name, [0.0, 0.0])
+            totals[0] += wall
+            totals[1] += cpu
+    
+    def report(self) -> str:
+        """
+        Формує текстовий звіт зі зібраною статистикою.
+        
+        Returns:
+            str: Відформатований звіт
+        """
+        lines = [
+            "=" * 50,
+            "Статистика виконання:",
+            "=" * 50,
+            f"{'Етап':<20} | {'Wall, с':<12} | {'CPU, с':<12}",
+            "-" * 50,
+        ]
+        total_wall = 0.0
+        total_cpu = 0.0
+        for name, (wall, cpu) in self.stages.items():
+            lines.append(f"{name:<20} | {wall:<12.6f} | {cpu:<12.6f}")
+            total_wall += wall
+            total_cpu += cpu
+        lines.append("-" * 50)
+        lines.append(f"{'Загалом':<20} | {total_wall:<12.6f} | {total_cpu:<12.6f}")
+        lines.append("-" * 50)
+        
+        # Пропускна здатність читання та парсингу рахується окремо
+        read_wall = self.stages.get("read", (0.0, 0.0))[0]
+        parse_wall = self.stages.get("parse", (0.0, 0.0))[0]
+        if read_wall > 0:
+            lines.append(f"Читання: {self.bytes / read_wall / (1024 * 1024):,.2f} МБ/с")
+        if parse_wall > 0:
+            lines.append(f"Парсинг: {self.lines / parse_wall:,.0f} рядків/с")
+        lines.append(f"Прочитано рядків: {self.lines} ({self.bytes} байт)")
+        lines.append(f"Порожніх рядків: {self.blank_lines}")
+        lines.append(f"Помилок парсингу: {self.parse_failures}")
+        if self.peak_memory is not None:
+            lines.append(f"Пікова пам'ять (RSS): {self.peak_memory / (1024 * 1024):.2f} МБ")
+        lines.append("=" * 50)
+        return "\n".join(lines)
+
+
+def _peak_rss() -> Optional[int]:
+    """
+    Повертає пікову резидентну пам'ять процесу в байтах або None,
+    якщо модуль resource недоступний (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux повертає кілобайти, macOS - байти
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _stage(stats: Optional[PipelineStats], name: str) -> contextlib.AbstractContextManager:
+    """
+    Повертає менеджер контексту для етапу або порожній, якщо статистика вимкнена.
+    """
+    if stats is None:
+        return contextlib.nullcontext()
+    return stats.stage(name)
+
+
 def parse_log_line(line: str) -> Optional[Dict[str, str]]:
     """
     Парсить рядок логу та повертає словник з компонентами.
@@ -60,12 +173,44 @@ def parse_log_line(line: str) -> Optional[Dict[str, str]]:
     return None
 
 
-def load_logs(file_path: str) -> List[Dict[str, str]]:
+# Кількість рядків, що читаються та парсяться за одну порцію при зборі статистики
+STATS_CHUNK_LINES = 65536
+
+
+def _load_logs_timed(file, stats: PipelineStats) -> List[Dict[str, str]]:
+    """
+    Завантажує логи з відкритого файлу, вимірюючи читання та парсинг окремо.
+    
+    Файл читається тим самим порядковим ітератором, що й без статистики,
+    але порціями по STATS_CHUNK_LINES рядків: кожна порція спершу читається
+    (етап "read"), потім парситься (етап "parse").
+    """
+    logs = []
+    while True:
+        with stats.stage("read"):
+            chunk = list(itertools.islice(file, STATS_CHUNK_LINES))
+        if not chunk:
+            return logs
+        with stats.stage("parse"):
+            parsed_lines = [parse_log_line(line) for line in chunk]
+        
+        stats.lines += len(chunk)
+        for line, parsed in zip(chunk, parsed_lines):
+            if parsed is not None:
+                logs.append(parsed)
+            elif line.strip():
+                stats.parse_failures += 1
+            else:
+                stats.blank_lines += 1
+
+
+def load_logs(file_path: str, stats: Optional[PipelineStats] = None) -> List[Dict[str, str]]:
     """
     Завантажує та парсить лог-файл.
     
     Args:
         file_path (str): Шлях до лог-файлу
+        stats (Optional[PipelineStats]): Збирач статистики або None
         
     Returns:
         List[Dict[str, str]]: Список розпарсених записів логу
@@ -79,10 +224,14 @@ def load_logs(file_path: str) -> List[Dict[str, str]]:
     
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            # Використовуємо list comprehension та filter для функціонального стилю
-            # Спочатку парсимо всі рядки, потім фільтруємо None значення
-            parsed_lines = [parse_log_line(line) for line in file]
-            logs = list(filter(lambda x: x is not None, parsed_lines))
+            if stats is not None:
+                logs = _load_logs_timed(file, stats)
+                stats.bytes += os.path.getsize(file_path)
+            else:
+                # Використовуємо list comprehension та filter для функціонального стилю
+                # Спочатку парсимо всі рядки, потім фільтруємо None значення
+                parsed_lines = [parse_log_line(line) for line in file]
+                logs = list(filter(lambda x: x is not None, parsed_lines))
             
     except FileNotFoundError:
         raise FileNotFoundError(f"Файл '{file_path}' не знайдено")
@@ -195,18 +344,19 @@ def display_filtered_logs(logs: List[Dict[str, str]], level: str) -> None:
     print("="*80)
 
 
-def create_log_analyzer() -> Callable[[str, Optional[str]], None]:
+def create_log_analyzer() -> Callable[..., None]:
     """
     Створює функцію-аналізатор логів (приклад функції вищого порядку).
     
     Returns:
         Callable: Функція для аналізу логів
     """
-    def analyze_logs(file_path: str, filter_level: Optional[str] = None) -> None:
+    def analyze_logs(file_path: str, filter_level: Optional[str] = None,
+                     stats: Optional[PipelineStats] = None) -> None:
         """Аналізує лог-файл та виводить результати"""
         try:
             # Завантажуємо логи
-            logs = load_logs(file_path)
+            logs = load_logs(file_path, stats)
             
             if not logs:
                 print("Файл логів порожній або не містить коректних записів")
@@ -214,20 +364,24 @@ def create_log_analyzer() -> Callable[[str, Optional[str]], None]:
             
             # Якщо вказано рівень для фільтрації
             if filter_level:
-                filtered_logs = filter_logs_by_level(logs, filter_level)
-                display_filtered_logs(filtered_logs, filter_level)
+                with _stage(stats, "filter"):
+                    filtered_logs = filter_logs_by_level(logs, filter_level)
+                with _stage(stats, "display"):
+                    display_filtered_logs(filtered_logs, filter_level)
             else:
                 # Виводимо загальну статистику
-                counts = count_logs_by_level(logs)
-                display_log_counts(counts)
-                
-                # Додаткова інформація
-                print(f"\nЗагальна кількість записів: {len(logs)}")
-                
-                # Знаходимо найчастіший рівень за допомогою функціонального програмування
-                if counts:
-                    most_common_level = max(counts.items(), key=lambda x: x[1])
-                    print(f"Найчастіший рівень: {most_common_level[0]} ({most_common_level[1]} разів)")
+                with _stage(stats, "count"):
+                    counts = count_logs_by_level(logs)
+                with _stage(stats, "display"):
+                    display_log_counts(counts)
+                    
+                    # Додаткова інформація
+                    print(f"\nЗагальна кількість записів: {len(logs)}")
+                    
+                    # Знаходимо найчастіший рівень за допомогою функціонального програмування
+                    if counts:
+                        most_common_level = max(counts.items(), key=lambda x: x[1])
+                        print(f"Найчастіший рівень: {most_common_level[0]} ({most_common_level[1]} разів)")
         
         except Exception as e:
             print(f"Помилка при обробці файлу: {e}")
@@ -248,6 +402,8 @@ def main() -> None:
   %(prog)s /path/to/logfile.log
   %(prog)s /path/to/logfile.log ERROR
   %(prog)s /path/to/logfile.log info
+  %(prog)s /path/to/logfile.log --stats
+  %(prog)s /path/to/logfile.log ERROR --profile profile.out
         """
     )
     
@@ -262,6 +418,18 @@ def main() -> None:
         help='Рівень логування для фільтрації (INFO, ERROR, DEBUG, WARNING)'
     )
     
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Вивести час за етапами, пропускну здатність, помилки парсингу та пікову RSS'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        metavar='FILE',
+        help='Зберегти результати cProfile у файл (вмикає --stats; під профайлером час етапів завищений)'
+    )
+    
     args = parser.parse_args()
     
     # Перевіряємо існування файлу
@@ -271,7 +439,31 @@ def main() -> None:
     
     # Створюємо та використовуємо аналізатор
     analyzer = create_log_analyzer()
-    analyzer(args.file_path, args.level)
+    
+    if not (args.stats or args.profile):
+        analyzer(args.file_path, args.level)
+        return
+    
+    stats = PipelineStats()
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+    
+    try:
+        if profiler is not None:
+            profiler.enable()
+        analyzer(args.file_path, args.level, stats)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        stats.peak_memory = _peak_rss()
+    
+    print("\n" + stats.report(), file=sys.stderr)
+    
+    if profiler is not None:
+        profiler.dump_stats(args.profile)
+        print(f"Профіль cProfile збережено у '{args.profile}'", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки адресної книги з завдання 4.
+
+Генерує велику адресну книгу з випадковими контактами та вимірює
+швидкодію операцій бота.
+
+Використання:
+    python benchmark.py search
+    python benchmark.py search --count 1000000 --queries 200
+    python benchmark.py server --port 8765 --clients 2000 --commands 50
+    python benchmark.py memory --count 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import string
+import time
+import tracemalloc
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from compact import CompactContactStore
+from task4 import ContactBook
+
+
+def generate_contacts(count: int, seed: int = 42) -> Iterator[Tuple[str, str]]:
+    """
+    Генерує унікальні контакти з випадковими іменами та телефонами.
+
+    Args:
+        count (int): Кількість контактів
+        seed (int): Зерно генератора випадкових чисел
+
+    Yields:
+        Tuple[str, str]: Пари (ім'я, телефон)
+    """
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase
+    for i in range(count):
+        # Суфікс з номером гарантує унікальність імені
+        name = rng.choice(string.ascii_uppercase) + "".join(rng.choices(letters, k=6)) + str(i)
+        phone = "0" + "".join(rng.choices(string.digits, k=9))
+        yield name, phone
+
+
+def scan_search(contacts: Dict[str, str], query: str) -> List[Tuple[str, str]]:
+    """Пошук повним переглядом, як у початковій версії search_contacts."""
+    return [(name, phone) for name, phone in contacts.items()
+            if query in name.lower() or query in phone]
+
+
+def bench_search(count: int, queries: int) -> None:
+    """
+    Порівнює пошук через індекс ContactBook з повним переглядом словника.
+
+    Args:
+        count (int): Кількість контактів у книзі
+        queries (int): Кількість пошукових запитів
+    """
+    data = dict(generate_contacts(count))
+
+    # Запити - фрагменти існуючих імен та телефонів: довгі повертають мало
+    # результатів, короткі (1-2 символи) - значну частину книги
+    rng = random.Random(7)
+    names = rng.sample(list(data), queries)
+    groups = {
+        "довгі": [name[1:6].lower() if i % 2 else data[name][3:9]
+                  for i, name in enumerate(names)],
+        "короткі": [name[1:1 + i % 2 + 1].lower() if i % 4 < 2 else data[name][3:3 + i % 2 + 1]
+                    for i, name in enumerate(names)],
+    }
+
+    # Індекс будується одним проходом при першому пошуку
+    start = time.perf_counter()
+    book = ContactBook(data)
+    book.search(groups["довгі"][0])
+    print(f"Індексація {count:,} контактів: {time.perf_counter() - start:.2f} с")
+
+    for label, sample in groups.items():
+        timings = []
+        for query in sample:
+            start = time.perf_counter()
+            book.search(query)
+            timings.append(time.perf_counter() - start)
+
+        # Перевіряємо ідентичність результатів на частині запитів
+        scan_timings = []
+        for query in sample[:10]:
+            start = time.perf_counter()
+            expected = scan_search(data, query)
+            scan_timings.append(time.perf_counter() - start)
+            assert book.search(query) == expected, query
+
+        print(f"Запити {label}:")
+        print(f"  Індекс:   медіана {statistics.median(timings) * 1000:.3f} мс, "
+              f"максимум {max(timings) * 1000:.3f} мс на запит")
+        print(f"  Перегляд: медіана {statistics.median(scan_timings) * 1000:.3f} мс на запит")
+
+
+async def _run_client(client_id: int, commands: int, host: str, port: int,
+                      unix: Optional[str]) -> float:
+    """
+    Один клієнт навантаження: надсилає всі команди без очікування відповідей
+    і читає відповіді до кінця.
+
+    Returns:
+        float: Час від підключення до отримання останньої відповіді, с
+    """
+    start = time.perf_counter()
+    if unix:
+        reader, writer = await asyncio.open_unix_connection(unix)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    # Половина команд змінює книгу, половина - читає
+    lines = []
+    for i in range(commands):
+        name = f"c{client_id}_{i // 2}"
+        if i % 2 == 0:
+            lines.append(f"add {name} 0{client_id:04d}{i:05d}")
+        else:
+            lines.append(f"phone {name}")
+    writer.write(("\n".join(lines) + "\n").encode("utf-8"))
+    await writer.drain()
+
+    responses = 0
+    while responses < commands:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        if line == b".\n":
+            responses += 1
+
+    writer.close()
+    await writer.wait_closed()
+    return time.perf_counter() - start
+
+
+async def _run_load(clients: int, commands: int, host: str, port: int,
+                    unix: Optional[str]) -> None:
+    start = time.perf_counter()
+    timings = await asyncio.gather(*(
+        _run_client(client_id, commands, host, port, unix) for client_id in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+
+    total = clients * commands
+    timings = sorted(timings)
+    print(f"{clients:,} клієнтів x {commands:,} команд = {total:,} команд за {elapsed:.2f} с")
+    print(f"Пропускна здатність: {total / elapsed:,.0f} команд/с")
+    print(f"Час клієнта: медіана {statistics.median(timings) * 1000:.1f} мс, "
+          f"p99 {timings[int(len(timings) * 0.99) - 1] * 1000:.1f} мс")
+
+
+def bench_server(clients: int, commands: int, host: str, port: int,
+                 unix: Optional[str]) -> None:
+    """
+    Генератор навантаження для server.py: багато одночасних клієнтів
+    з конвеєрною відправкою команд.
+
+    Args:
+        clients (int): Кількість одночасних з'єднань
+        commands (int): Кількість команд від кожного клієнта
+        host (str): Адреса TCP-сервера
+        port (int): Порт TCP-сервера
+        unix (Optional[str]): Шлях до Unix-сокета замість TCP
+    """
+    asyncio.run(_run_load(clients, commands, host, port, unix))
+
+
+def _measure_memory(factory, count: int) -> Tuple[int, Optional[int]]:
+    """
+    Заповнює сховище згенерованими контактами та повертає виділену пам'ять.
+
+    Рядки генеруються всередині виміру, тож для словника враховуються
+    об'єкти імен і телефонів, а для компактного сховища - лише його масиви.
+
+    Returns:
+        Tuple[int, Optional[int]]: Пам'ять за tracemalloc і обсяг, який
+        сховище повідомляє саме (nbytes), якщо воно це вміє
+    """
+    tracemalloc.start()
+    store = factory()
+    for name, phone in generate_contacts(count):
+        store[name] = phone
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    reported = store.nbytes() if hasattr(store, "nbytes") else None
+    del store
+    return used, reported
+
+
+def bench_memory(count: int, with_book: bool) -> None:
+    """
+    Порівнює пам'ять на контакт у dict, CompactContactStore та ContactBook.
+
+    Args:
+        count (int): Кількість контактів
+        with_book (bool): Чи вимірювати також ContactBook з індексами
+    """
+    factories = [("dict", dict), ("CompactContactStore", CompactContactStore)]
+    if with_book:
+        factories.append(("ContactBook", ContactBook))
+
+    baseline = None
+    for label, factory in factories:
+        used, reported = _measure_memory(factory, count)
+        baseline = baseline or used
+        print(f"{label:<20} {used / count:8.1f} байт/контакт "
+              f"({used / (1024 * 1024):,.1f} МБ, {used / baseline:.2f}x від dict)")
+        if reported is not None:
+            # Різниця з tracemalloc - запас місткості масивів при зростанні
+            print(f"{'':<20} {reported / count:8.1f} байт/контакт у масивах (nbytes)")
+
+
+def main() -> None:
+    """Обробляє аргументи командного рядка та запускає бенчмарк."""
+    parser = argparse.ArgumentParser(description="Бенчмарки адресної книги")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    search_parser = subparsers.add_parser("search", help="Пошук за підрядком")
+    search_parser.add_argument("--count", type=int, default=1_000_000,
+                               help="Кількість контактів")
+    search_parser.add_argument("--queries", type=int, default=200,
+                               help="Кількість запитів")
+
+    server_parser = subparsers.add_parser("server", help="Навантаження на server.py")
+    server_parser.add_argument("--host", default="127.0.0.1", help="Адреса TCP-сервера")
+    server_parser.add_argument("--port", type=int, default=8765, help="Порт TCP-сервера")
+    server_parser.add_argument("--unix", metavar="PATH", help="Шлях до Unix-сокета")
+    server_parser.add_argument("--clients", type=int, default=2000,
+                               help="Кількість одночасних з'єднань")
+    server_parser.add_argument("--commands", type=int, default=50,
+                               help="Кількість команд від кожного клієнта")
+
+    memory_parser = subparsers.add_parser("memory", help="Пам'ять на контакт")
+    memory_parser.add_argument("--count", type=int, default=1_000_000,
+                               help="Кількість контактів")
+    memory_parser.add_argument("--book", action="store_true",
+                               help="Виміряти також ContactBook з індексами")
+
+    args = parser.parse_args()
+    if args.benchmark == "search":
+        bench_search(args.count, args.queries)
+    elif args.benchmark == "server":
+        bench_server(args.clients, args.commands, args.host, args.port, args.unix)
+    elif args.benchmark == "memory":
+        bench_memory(args.count, args.book)
+
+
+if __name__ == "__main__":
+    main()
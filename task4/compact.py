@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Компактне сховище контактів для дуже великих адресних книг з завдання 4.
+
+Звичайний Dict[str, str] зберігає кожне ім'я та телефон окремим об'єктом
+Python, і на десятках мільйонів контактів накладні витрати об'єктів
+займають більшу частину пам'яті. CompactContactStore тримає ті самі дані
+у кількох плоских масивах:
+
+    - імена - в одній арені байтів UTF-8 (bytearray) з таблицею зміщень;
+    - телефони з цифр (з необов'язковим "+") - упаковані в 64-бітні числа
+      масиву array('Q'); інші телефони зберігаються в арені;
+    - хеш-таблиця з відкритою адресацією (лінійне зондування) зводить
+      ім'я до номера слота;
+    - друга така таблиця зводить нормалізований телефон до слотів його
+      власників (whois та попередження про спільні номери).
+
+Сховище реалізує MutableMapping, тому обробники команд працюють з ним
+так само, як зі словником. Пошук за підрядком та сортування для нього
+виконуються повним переглядом, як для звичайного словника.
+"""
+
+from array import array
+from collections import abc
+from typing import Any, Dict, Iterator, List, Tuple
+
+from phones import normalize_phone
+
+
+# Порожня комірка та видалений запис у хеш-таблиці
+_EMPTY = -1
+_TOMBSTONE = -2
+
+# Позначка видаленого слота в таблиці зміщень імен
+_DELETED = (1 << 64) - 1
+
+# Упакований телефон: біт 63 - "+", біти 58-62 - кількість цифр, біти 0-57 - число.
+# Нульова кількість цифр означає, що молодші біти - зміщення телефону в арені.
+_PLUS_FLAG = 1 << 63
+_LENGTH_SHIFT = 58
+_LENGTH_MASK = 0x1F
+_NUMBER_MASK = (1 << _LENGTH_SHIFT) - 1
+# Найбільша кількість цифр, що гарантовано вміщується в 58 біт
+PACKED_DIGITS = 17
+
+_INITIAL_CAPACITY = 8
+
+# Арена компактується, коли невикористані байти займають більше половини,
+# але не раніше, ніж їх набереться стільки
+COMPACT_MIN_GARBAGE = 64 * 1024
+
+
+class _ItemsView(abc.ItemsView):
+    """ItemsView, що читає пари прямо з масивів сховища."""
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return self._mapping._iter_items()
+
+
+class CompactContactStore(abc.MutableMapping):
+    """
+    Словник ім'я -> телефон з мінімальними накладними витратами на контакт.
+
+    Порядок ітерації - порядок додавання, як у dict. Видалені записи та
+    замінені телефони залишаються в масивах до компактування, яке
+    запускається, коли видалених слотів стає більше, ніж живих, або коли
+    невикористані байти займають більше половини арени.
+
+    Якщо задано атрибут journal (див. storage.ContactJournal), кожна зміна
+    також записується в журнал.
+
+    Example:
+        >>> store = CompactContactStore({"John": "0501234567"})
+        >>> store["John"]
+        '0501234567'
+        >>> store["Jane"] = "+380501234567"
+        >>> list(store.items())
+        [('John', '0501234567'), ('Jane', '+380501234567')]
+    """
+
+    def __init__(self, data: Any = None) -> None:
+        self._reset()
+        # Журнал змін для збереження на диск (None - лише в пам'яті)
+        self.journal: Any = None
+        if data:
+            self.update(data)
+
+    def _reset(self) -> None:
+        """Створює порожні масиви сховища."""
+        self._arena = bytearray()
+        # Для кожного слота: зміщення імені в арені, хеш імені, телефон
+        self._name_offsets = array("Q")
+        self._hashes = array("q")
+        self._phones = array("Q")
+        self._table = array("q", [_EMPTY]) * _INITIAL_CAPACITY
+        self._mask = _INITIAL_CAPACITY - 1
+        # Зайняті комірки таблиці разом з видаленими
+        self._filled = 0
+        self._size = 0
+        self._dead = 0
+        # Індекс телефонів: хеш нормалізованого номера для кожного слота
+        # і таблиця, в якій кожен слот з номером займає окрему комірку
+        self._phone_hashes = array("q")
+        self._phone_table = array("q", [_EMPTY]) * _INITIAL_CAPACITY
+        self._phone_filled = 0
+        self._phone_count = 0
+        # Байти арени, що належать видаленим іменам і заміненим телефонам
+        self._garbage = 0
+
+    # -------------------- Арена --------------------
+
+    def _append_bytes(self, data: bytes) -> int:
+        """Дописує в арену байти з префіксом довжини та повертає їх зміщення."""
+        offset = len(self._arena)
+        length = len(data)
+        if length < 0xFF:
+            self._arena.append(length)
+        else:
+            self._arena.append(0xFF)
+            self._arena += length.to_bytes(4, "little")
+        self._arena += data
+        return offset
+
+    def _read_bytes(self, offset: int) -> bytes:
+        """Читає з арени байти, записані _append_bytes."""
+        arena = self._arena
+        length = arena[offset]
+        start = offset + 1
+        if length == 0xFF:
+            length = int.from_bytes(arena[start:start + 4], "little")
+            start += 4
+        return bytes(arena[start:start + length])
+
+    def _entry_size(self, offset: int) -> int:
+        """Повертає повний розмір запису арени разом з префіксом довжини."""
+        length = self._arena[offset]
+        if length == 0xFF:
+            return 5 + int.from_bytes(self._arena[offset + 1:offset + 5], "little")
+        return 1 + length
+
+    def _name(self, slot: int) -> str:
+        return self._read_bytes(self._name_offsets[slot]).decode("utf-8", "surrogatepass")
+
+    # -------------------- Телефони --------------------
+
+    def _pack_phone(self, phone: str) -> int:
+        """Пакує телефон у 64-бітне число або зберігає його в арені."""
+        digits = phone[1:] if phone.startswith("+") else phone
+        if 0 < len(digits) <= PACKED_DIGITS and digits.isascii() and digits.isdigit():
+            value = (len(digits) << _LENGTH_SHIFT) | int(digits)
+            return value | _PLUS_FLAG if digits is not phone else value
+        return self._append_bytes(phone.encode("utf-8", "surrogatepass"))
+
+    def _unpack_phone(self, value: int) -> str:
+        length = (value >> _LENGTH_SHIFT) & _LENGTH_MASK
+        if length == 0:
+            return self._read_bytes(value).decode("utf-8", "surrogatepass")
+        digits = str(value & _NUMBER_MASK).zfill(length)
+        return "+" + digits if value & _PLUS_FLAG else digits
+
+    def _release_phone(self, value: int) -> None:
+        """Враховує байти телефону з арени як невикористані."""
+        if (value >> _LENGTH_SHIFT) & _LENGTH_MASK == 0:
+            self._garbage += self._entry_size(value)
+
+    def phone_owners(self, phone: str) -> List[str]:
+        """
+        Повертає імена контактів з тим самим нормалізованим номером.
+
+        Args:
+            phone (str): Телефон у довільному форматі
+
+        Returns:
+            List[str]: Імена у порядку додавання контактів
+        """
+        key = normalize_phone(phone)
+        if not key:
+            return []
+        h = hash(key)
+        table = self._phone_table
+        mask = len(table) - 1
+        slots = []
+        i = h & mask
+        while True:
+            slot = table[i]
+            if slot == _EMPTY:
+                break
+            if (slot != _TOMBSTONE and self._phone_hashes[slot] == h
+                    and normalize_phone(self._unpack_phone(self._phones[slot])) == key):
+                slots.append(slot)
+            i = (i + 1) & mask
+        return [self._name(slot) for slot in sorted(slots)]
+
+    def _link_phone(self, slot: int, phone: str) -> None:
+        """Додає слот до індексу телефонів."""
+        key = normalize_phone(phone)
+        if not key:
+            return
+        h = hash(key)
+        self._phone_hashes[slot] = h
+        table = self._phone_table
+        mask = len(table) - 1
+        i = h & mask
+        while table[i] >= 0:
+            i = (i + 1) & mask
+        if table[i] == _EMPTY:
+            self._phone_filled += 1
+        table[i] = slot
+        self._phone_count += 1
+        if self._phone_filled * 3 >= len(table) * 2:
+            self._resize_phones(len(table) * 2 if self._phone_count * 3 >= len(table) else
+                                len(table))
+
+    def _unlink_phone(self, slot: int, phone: str) -> None:
+        """Прибирає слот з індексу телефонів."""
+        if not normalize_phone(phone):
+            return
+        table = self._phone_table
+        mask = len(table) - 1
+        i = self._phone_hashes[slot] & mask
+        while table[i] != slot:
+            i = (i + 1) & mask
+        table[i] = _TOMBSTONE
+        self._phone_count -= 1
+
+    def _resize_phones(self, capacity: int) -> None:
+        """Перебудовує таблицю телефонів заданої місткості."""
+        table = array("q", [_EMPTY]) * capacity
+        mask = capacity - 1
+        hashes = self._phone_hashes
+        for slot in self._phone_table:
+            if slot < 0:
+                continue
+            i = hashes[slot] & mask
+            while table[i] != _EMPTY:
+                i = (i + 1) & mask
+            table[i] = slot
+        self._phone_table = table
+        self._phone_filled = self._phone_count
+
+    # -------------------- Хеш-таблиця --------------------
+
+    def _lookup(self, name: str) -> Tuple[int, int]:
+        """
+        Шукає ім'я в хеш-таблиці.
+
+        Returns:
+            Tuple[int, int]: (позиція в таблиці, слот); якщо імені немає,
+            слот дорівнює _EMPTY, а позиція - комірка для вставки
+        """
+        h = hash(name)
+        key = None
+        table = self._table
+        hashes = self._hashes
+        mask = self._mask
+        i = h & mask
+        free = -1
+        while True:
+            slot = table[i]
+            if slot == _EMPTY:
+                return (i if free < 0 else free), _EMPTY
+            if slot == _TOMBSTONE:
+                if free < 0:
+                    free = i
+            elif hashes[slot] == h:
+                if key is None:
+                    key = name.encode("utf-8", "surrogatepass")
+                if self._read_bytes(self._name_offsets[slot]) == key:
+                    return i, slot
+            i = (i + 1) & mask
+
+    def _resize(self, capacity: int) -> None:
+        """Перебудовує хеш-таблицю заданої місткості зі збережених хешів."""
+        table = array("q", [_EMPTY]) * capacity
+        mask = capacity - 1
+        hashes = self._hashes
+        offsets = self._name_offsets
+        for slot in range(len(offsets)):
+            if offsets[slot] == _DELETED:
+                continue
+            i = hashes[slot] & mask
+            while table[i] != _EMPTY:
+                i = (i + 1) & mask
+            table[i] = slot
+        self._table = table
+        self._mask = mask
+        self._filled = self._size
+
+    def _compact(self) -> None:
+        """Прибирає видалені слоти та невикористані байти арени."""
+        items = list(self._iter_items())
+        journal = self.journal
+        self._reset()
+        self.journal = None
+        for name, phone in items:
+            self[name] = phone
+        self.journal = journal
+
+    # -------------------- MutableMapping --------------------
+
+    def __getitem__(self, name: str) -> str:
+        _, slot = self._lookup(name)
+        if slot == _EMPTY:
+            raise KeyError(name)
+        return self._unpack_phone(self._phones[slot])
+
+    def __setitem__(self, name: str, phone: str) -> None:
+        position, slot = self._lookup(name)
+        if slot != _EMPTY:
+            old_value = self._phones[slot]
+            self._unlink_phone(slot, self._unpack_phone(old_value))
+            self._release_phone(old_value)
+            self._phones[slot] = self._pack_phone(phone)
+            self._link_phone(slot, phone)
+        else:
+            slot = len(self._name_offsets)
+            self._name_offsets.append(self._append_bytes(name.encode("utf-8", "surrogatepass")))
+            self._hashes.append(hash(name))
+            self._phones.append(self._pack_phone(phone))
+            self._phone_hashes.append(0)
+            self._link_phone(slot, phone)
+            if self._table[position] == _EMPTY:
+                self._filled += 1
+            self._table[position] = slot
+            self._size += 1
+            # Коефіцієнт заповнення таблиці не більше 2/3
+            if self._filled * 3 >= len(self._table) * 2:
+                self._resize(len(self._table) * 2 if self._size * 3 >= len(self._table) else
+                             len(self._table))
+        if self.journal is not None:
+            self.journal.record_set(name, phone)
+        if self._garbage_due():
+            self._compact()
+
+    def __delitem__(self, name: str) -> None:
+        position, slot = self._lookup(name)
+        if slot == _EMPTY:
+            raise KeyError(name)
+        value = self._phones[slot]
+        self._unlink_phone(slot, self._unpack_phone(value))
+        self._release_phone(value)
+        self._garbage += self._entry_size(self._name_offsets[slot])
+        self._table[position] = _TOMBSTONE
+        self._name_offsets[slot] = _DELETED
+        self._size -= 1
+        self._dead += 1
+        if self.journal is not None:
+            self.journal.record_delete(name)
+        if (self._dead > self._size and self._dead >= 1024) or self._garbage_due():
+            self._compact()
+
+    def _garbage_due(self) -> bool:
+        """Чи займають невикористані байти більше половини арени."""
+        return self._garbage >= COMPACT_MIN_GARBAGE and self._garbage * 2 > len(self._arena)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._lookup(name)[1] != _EMPTY
+
+    def __iter__(self) -> Iterator[str]:
+        offsets = self._name_offsets
+        for slot in range(len(offsets)):
+            if offsets[slot] != _DELETED:
+                yield self._name(slot)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def _iter_items(self) -> Iterator[Tuple[str, str]]:
+        offsets = self._name_offsets
+        phones = self._phones
+        for slot in range(len(offsets)):
+            if offsets[slot] != _DELETED:
+                yield self._name(slot), self._unpack_phone(phones[slot])
+
+    def items(self) -> "_ItemsView":
+        """Повертає пари (ім'я, телефон); ітерація не виконує пошуку в таблиці."""
+        return _ItemsView(self)
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        Повертає копію контактів у вигляді звичайного словника.
+        """
+        return dict(self._iter_items())
+
+    def nbytes(self) -> int:
+        """
+        Повертає обсяг пам'яті масивів сховища в байтах.
+        """
+        arrays = (self._name_offsets, self._hashes, self._phones, self._table,
+                  self._phone_hashes, self._phone_table)
+        return len(self._arena) + sum(a.itemsize * len(a) for a in arrays)
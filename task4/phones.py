@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Нормалізація телефонів для адресної книги з завдання 4.
+
+Спільна для ContactBook (task4) та CompactContactStore (compact), щоб обидва
+сховища індексували номери однаково.
+"""
+
+import re
+
+
+# Код країни та національний префікс для нормалізації телефонів
+DEFAULT_COUNTRY_CODE = "380"
+TRUNK_PREFIX = "0"
+
+_NON_DIGITS = re.compile(r"[^0-9]")
+
+
+def normalize_phone(phone: str) -> str:
+    """
+    Зводить телефон до канонічної форми з цифр міжнародного номера.
+
+    Усі символи, крім цифр, відкидаються. Міжнародний префікс 00
+    прибирається, а національні номери (з TRUNK_PREFIX на початку)
+    доповнюються кодом країни DEFAULT_COUNTRY_CODE.
+
+    Args:
+        phone (str): Телефон у довільному форматі
+
+    Returns:
+        str: Канонічна форма (порожня, якщо в номері немає цифр)
+
+    Example:
+        >>> normalize_phone("+380 50 123 4567")
+        '380501234567'
+        >>> normalize_phone("050-123-45-67")
+        '380501234567'
+    """
+    # Швидкий шлях для номерів, що вже складаються лише з цифр
+    if phone.isascii() and phone.isdigit():
+        digits = phone
+        international = False
+    else:
+        digits = _NON_DIGITS.sub("", phone)
+        international = phone.lstrip().startswith("+")
+
+    if digits.startswith("00"):
+        return digits[2:]
+    if digits.startswith(TRUNK_PREFIX) and not international:
+        return DEFAULT_COUNTRY_CODE + digits[len(TRUNK_PREFIX):]
+    return digits
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Мережевий режим бота з завдання 4 на asyncio streams.
+
+Багато клієнтів підключаються по TCP або Unix-сокету і працюють з однією
+спільною адресною книгою. Кожен рядок від клієнта розбирається parse_input
+і виконується тією ж командною мапою, що й в інтерактивному режимі.
+
+Обробники команд синхронні й виконуються в потоці циклу подій, тому кожна
+команда атомарна відносно інших клієнтів: зміни книги серіалізуються без
+додаткових блокувань.
+
+Протокол (рядковий, UTF-8):
+    - клієнт надсилає команди по одній на рядок і може не чекати відповіді
+      перед наступною командою (pipelining); відповіді йдуть у тому ж порядку;
+    - кожна відповідь - це рядки результату, після яких іде рядок ".";
+      рядки результату, що починаються з ".", доповнюються ще однією крапкою;
+    - порожні рядки ігноруються і відповіді не мають;
+    - команди завершення (exit, close, ...) отримують "Good bye!" і закривають
+      з'єднання;
+    - на рядок, довший за 64 КіБ, сервер відповідає помилкою і закриває
+      з'єднання;
+    - команди import та export недоступні: вони працюють з файлами на
+      машині сервера;
+    - all та search повертають не більше PAGE_LIMIT контактів; наступні
+      сторінки all запитуються як "all <offset> <limit>".
+
+Використання:
+    python server.py --port 8765
+    python server.py --unix /tmp/contacts.sock --data contacts_db
+    python server.py --port 8765 --metrics
+"""
+
+import argparse
+import asyncio
+from typing import Callable, Dict
+
+from task4 import (ContactBook, EXIT_COMMANDS, build_command_handlers, enable_metrics,
+                   execute_command, parse_input)
+
+
+# Рядок, що завершує кожну відповідь
+END_OF_RESPONSE = b".\n"
+
+# Обсяг неперевіреного буфера запису, після якого чекаємо на клієнта
+DRAIN_THRESHOLD = 64 * 1024
+
+# Найбільша кількість контактів в одній відповіді all та search. Відповідь
+# пишеться в буфер транспорту до наступного drain, тож без обмеження
+# список на всю книгу тримався б у пам'яті для кожного клієнта, а цикл
+# подій не обслуговував би інших клієнтів, доки його формує
+PAGE_LIMIT = 1000
+
+
+class _ResponseWriter:
+    """
+    Текстовий потік, що пише відповідь у транспорт клієнта з dot-stuffing.
+
+    Використовується як out для потокових команд (all), тому великі списки
+    не збираються в один рядок перед відправкою.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self._writer = writer
+
+    def write(self, text: str) -> int:
+        if text.startswith("."):
+            self._writer.write(b".")
+        # Потокові команди пишуть по одному рядку за виклик
+        self._writer.write(text.replace("\n.", "\n..").encode("utf-8"))
+        return len(text)
+
+
+class ContactServer:
+    """
+    Сервер, що обслуговує багатьох клієнтів над спільною адресною книгою.
+
+    Example:
+        >>> server = ContactServer(ContactBook())
+        >>> asyncio.run(server.serve_tcp("127.0.0.1", 8765))
+    """
+
+    def __init__(self, contacts: ContactBook) -> None:
+        self.contacts = contacts
+        self.connections = 0
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """
+        Обслуговує одне з'єднання: читає команди та пише відповіді по порядку.
+        """
+        self.connections += 1
+        out = _ResponseWriter(writer)
+        # import та export працюють з файлами сервера за довільним шляхом
+        # і блокують цикл подій на весь файл, тому клієнтам вони недоступні
+        command_handlers: Dict[str, Callable[..., str]] = build_command_handlers(
+            self.contacts, out, allow_files=False, page_limit=PAGE_LIMIT)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Рядок довший за ліміт буфера читача: решту потоку вже
+                    # не розібрати на команди, тож відповідаємо і закриваємо
+                    writer.write(b"Command line is too long.\n" + END_OF_RESPONSE)
+                    break
+                if not line:
+                    break
+
+                user_input = line.decode("utf-8", errors="replace").strip()
+                if not user_input:
+                    continue
+
+                command, *args = parse_input(user_input)
+                if command in EXIT_COMMANDS:
+                    writer.write(b"Good bye!\n" + END_OF_RESPONSE)
+                    break
+
+                try:
+                    result = execute_command(command, args, command_handlers)
+                except Exception as e:
+                    result = f"Unexpected error: {e}"
+                if result:
+                    out.write(result)
+                    writer.write(b"\n")
+                writer.write(END_OF_RESPONSE)
+
+                # Поки клієнт надсилає команди пакетом, відповіді накопичуються
+                # в буфері транспорту; чекаємо лише коли буфер великий
+                if writer.transport.get_write_buffer_size() > DRAIN_THRESHOLD:
+                    await writer.drain()
+
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve_tcp(self, host: str, port: int, backlog: int = 4096) -> None:
+        """Приймає TCP-з'єднання, доки сервер не зупинено."""
+        server = await asyncio.start_server(self.handle_client, host, port, backlog=backlog)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_unix(self, path: str, backlog: int = 4096) -> None:
+        """Приймає з'єднання через Unix-сокет, доки сервер не зупинено."""
+        server = await asyncio.start_unix_server(self.handle_client, path, backlog=backlog)
+        async with server:
+            await server.serve_forever()
+
+
+def main() -> None:
+    """Обробляє аргументи командного рядка та запускає сервер."""
+    parser = argparse.ArgumentParser(description="Мережевий режим бота-помічника")
+    parser.add_argument("--host", default="127.0.0.1", help="Адреса для TCP")
+    parser.add_argument("--port", type=int, default=8765, help="Порт для TCP")
+    parser.add_argument("--unix", metavar="PATH", help="Шлях до Unix-сокета замість TCP")
+    parser.add_argument("--data", metavar="DIR",
+                        help="Каталог для збереження контактів (журнал та знімки)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Збирати метрики команд для команди stats")
+    args = parser.parse_args()
+
+    if args.metrics:
+        enable_metrics()
+
+    contacts = ContactBook()
+    journal = None
+    if args.data is not None:
+        from storage import ContactJournal
+
+        journal = ContactJournal(args.data)
+        journal.open(contacts)
+
+    server = ContactServer(contacts)
+    try:
+        if args.unix:
+            print(f"Serving on unix:{args.unix}")
+            asyncio.run(server.serve_unix(args.unix))
+        else:
+            print(f"Serving on {args.host}:{args.port}")
+            asyncio.run(server.serve_tcp(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nServer stopped. Good bye!")
+    finally:
+        if journal is not None:
+            journal.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Збереження адресної книги з завдання 4 на диск.
+
+Кожна зміна книги дописується в журнал (append-only) у форматі JSON lines.
+Записи накопичуються в пакети, і кожен пакет скидається на диск з fsync,
+коли він заповнився або коли найстаріший запис у ньому чекає довше за
+batch_interval (за цим стежить фоновий потік), тож при аварійному
+завершенні втрачається не більше одного пакета.
+
+Коли журнал стає не меншим за книгу (і за поріг компактування), він
+ротується, і записується знімок усієї книги. Знімок пишеться потоково
+з items() книги, без проміжної копії, тож для CompactContactStore пам'ять
+не виростає до розміру словника. Запис іде в основному потоці, доки
+книга не може змінитися, тому знімок описує стан саме на момент ротації;
+fsync, заміна попереднього знімка та видалення покритих журналів
+виконуються у фоновому потоці.
+
+При запуску знімок і хвіст журналу, записаний після нього, завантажуються
+порціями через update (ContactBook будує відсортований список та індекси
+одним проходом при першому використанні). Тому час запуску лінійний від
+розміру знімка плюс хвіст, а хвіст не більший за книгу.
+
+Структура каталогу:
+    snapshot.jsonl         - знімок: рядок {"generation": G}, далі по
+                             рядку [ім'я, телефон] на контакт
+    journal-000007.log     - журнали поколінь G і новіших
+"""
+
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from typing import Iterable, List, MutableMapping, Optional, TextIO, Tuple
+
+
+SNAPSHOT_NAME = "snapshot.jsonl"
+JOURNAL_PATTERN = re.compile(r"^journal-(\d+)\.log$")
+
+# Кількість контактів знімка або послідовних додавань журналу,
+# що завантажуються одним update
+REPLAY_BATCH_SIZE = 50_000
+
+
+def _journal_name(generation: int) -> str:
+    """Повертає ім'я файлу журналу для покоління."""
+    return f"journal-{generation:06d}.log"
+
+
+def _fsync_directory(directory: str) -> None:
+    """Синхронізує каталог, щоб перейменування та створення файлів пережили збій."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ContactJournal:
+    """
+    Журнал змін адресної книги з пакетним fsync та фоновим компактуванням.
+
+    Example:
+        >>> contacts = ContactBook()
+        >>> journal = ContactJournal("contacts_db")
+        >>> journal.open(contacts)   # завантажує знімок і хвіст журналу
+        >>> contacts["John"] = "0501234567"
+        >>> journal.close()
+    """
+
+    def __init__(self, directory: str, batch_size: int = 128, batch_interval: float = 1.0,
+                 compact_threshold: int = 100_000) -> None:
+        """
+        Args:
+            directory (str): Каталог для знімка та журналів
+            batch_size (int): Кількість записів у пакеті перед fsync
+            batch_interval (float): Максимальний вік пакета в секундах
+            compact_threshold (int): Мінімальна кількість записів у журналі,
+                після якої запускається компактування; для книги, більшої
+                за поріг, журнал компактується, коли стає не меншим за неї
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.compact_threshold = compact_threshold
+
+        self._contacts: Optional[MutableMapping[str, str]] = None
+        self._file: Optional[TextIO] = None
+        self._generation = 0
+        self._entries = 0
+        self._pending: List[str] = []
+        # Час появи найстарішого запису в поточному пакеті
+        self._pending_since = 0.0
+        # Захищає пакет і файл журналу від фонового потоку скидання
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flusher = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+        self._compact_error: Optional[BaseException] = None
+
+    # -------------------- Завантаження --------------------
+
+    def open(self, contacts: MutableMapping[str, str]) -> None:
+        """
+        Завантажує знімок і журнали в книгу та підключає журнал до неї.
+
+        Args:
+            contacts: Порожня книга контактів (ContactBook)
+
+        Raises:
+            ValueError: Якщо знімок або завершений журнал пошкоджено
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        snapshot_generation = 0
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_NAME)
+        if os.path.exists(snapshot_path):
+            snapshot_generation = self._load_snapshot(snapshot_path, contacts)
+
+        generations = sorted(self._journal_generations())
+        for generation in generations:
+            if generation < snapshot_generation:
+                # Залишок після збою між записом знімка та видаленням журналів
+                os.remove(self._journal_path(generation))
+        tail = [generation for generation in generations if generation >= snapshot_generation]
+
+        for i, generation in enumerate(tail):
+            self._entries = self._replay(generation, contacts, is_last=i == len(tail) - 1)
+
+        self._generation = tail[-1] if tail else snapshot_generation
+        if not tail:
+            self._entries = 0
+        self._file = open(self._journal_path(self._generation), "a", encoding="utf-8")
+        _fsync_directory(self.directory)
+
+        self._contacts = contacts
+        contacts.journal = self
+
+        self._stop_flusher.clear()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, name="contact-journal-flusher", daemon=True,
+        )
+        self._flusher.start()
+
+    def _load_snapshot(self, path: str, contacts: MutableMapping[str, str]) -> int:
+        """
+        Завантажує знімок у книгу порціями по REPLAY_BATCH_SIZE контактів.
+        
+        Returns:
+            int: Покоління знімка
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            generation = json.loads(file.readline())["generation"]
+            while True:
+                chunk = [json.loads(line) for line in itertools.islice(file, REPLAY_BATCH_SIZE)]
+                if not chunk:
+                    return generation
+                contacts.update(chunk)
+
+    def _journal_generations(self) -> List[int]:
+        """Повертає покоління всіх журналів у каталозі."""
+        generations = []
+        for entry in os.listdir(self.directory):
+            match = JOURNAL_PATTERN.match(entry)
+            if match:
+                generations.append(int(match.group(1)))
+        return generations
+
+    def _journal_path(self, generation: int) -> str:
+        return os.path.join(self.directory, _journal_name(generation))
+
+    def _replay(self, generation: int, contacts: MutableMapping[str, str], is_last: bool) -> int:
+        """
+        Відтворює один журнал у книзі.
+
+        Недописаний останній рядок останнього журналу (наслідок збою під час
+        запису) відкидається, а файл обрізається до останнього цілого запису.
+
+        Returns:
+            int: Кількість відтворених записів
+        """
+        path = self._journal_path(generation)
+        entries = 0
+        valid_size = 0
+        # Послідовні додавання застосовуються пакетами через update
+        pending: List[Tuple[str, str]] = []
+        with open(path, "rb") as file:
+            for raw_line in file:
+                try:
+                    if not raw_line.endswith(b"\n"):
+                        raise ValueError("incomplete journal record")
+                    op, *args = json.loads(raw_line)
+                    if op == "set":
+                        name, phone = args
+                        pending.append((name, phone))
+                    elif op == "del":
+                        name, = args
+                        contacts.update(pending)
+                        pending.clear()
+                        contacts.pop(name, None)
+                    else:
+                        raise ValueError(f"unknown journal operation {op!r}")
+                except ValueError:
+                    if not is_last:
+                        raise ValueError(f"Journal '{path}' is corrupted")
+                    break
+                entries += 1
+                valid_size += len(raw_line)
+                if len(pending) >= REPLAY_BATCH_SIZE:
+                    contacts.update(pending)
+                    pending.clear()
+        contacts.update(pending)
+
+        if is_last and valid_size != os.path.getsize(path):
+            with open(path, "r+b") as file:
+                file.truncate(valid_size)
+                os.fsync(file.fileno())
+        return entries
+
+    # -------------------- Запис --------------------
+
+    def record_set(self, name: str, phone: str) -> None:
+        """Записує додавання або зміну контакту."""
+        self._append(json.dumps(["set", name, phone], ensure_ascii=False))
+
+    def record_delete(self, name: str) -> None:
+        """Записує видалення контакту."""
+        self._append(json.dumps(["del", name], ensure_ascii=False))
+
+    def record_set_many(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        """
+        Записує пакет додавань одним записом у файл з одним fsync.
+
+        Компактування, якщо його час настав, запускається вже після
+        всього пакета.
+        """
+        encode = json.encoder.encode_basestring
+        records = [f'["set", {encode(name)}, {encode(phone)}]' for name, phone in pairs]
+        if not records:
+            return
+        with self._lock:
+            self._pending.extend(records)
+            self._entries += len(records)
+            self._flush_locked()
+        if self._compact_due():
+            self.compact()
+
+    def _append(self, record: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if not self._pending:
+                self._pending_since = now
+            self._pending.append(record)
+            self._entries += 1
+            if (len(self._pending) >= self.batch_size
+                    or now - self._pending_since >= self.batch_interval):
+                self._flush_locked()
+        if self._compact_due():
+            self.compact()
+
+    def _compact_due(self) -> bool:
+        """
+        Чи час компактувати: знімок пишеться за час, пропорційний книзі,
+        тому журнал має вирости хоча б до її розміру.
+        """
+        size = len(self._contacts) if self._contacts is not None else 0
+        return self._entries >= max(self.compact_threshold, size)
+
+    def flush(self) -> None:
+        """Записує поточний пакет у журнал і виконує fsync."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._file is None or not self._pending:
+            return
+        self._file.write("\n".join(self._pending) + "\n")
+        self._pending.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _flush_periodically(self) -> None:
+        """
+        Фоновий потік: скидає пакет, найстаріший запис якого чекає довше
+        за batch_interval, навіть якщо нових змін більше немає.
+        """
+        while not self._stop_flusher.wait(self.batch_interval / 2):
+            with self._lock:
+                if self._pending and time.monotonic() - self._pending_since >= self.batch_interval:
+                    self._flush_locked()
+
+    # -------------------- Компактування --------------------
+
+    def compact(self) -> None:
+        """
+        Ротує журнал і записує знімок книги.
+
+        Знімок пишеться потоково з живої книги одразу після ротації, і книга
+        не змінюється, доки запис не завершиться (компактування виконується
+        в потоці, що змінює книгу), тож знімок разом з новим журналом завжди
+        описує актуальний стан. Фоновий потік лише робить fsync, замінює
+        попередній знімок і видаляє старі журнали. Якщо попереднє
+        компактування ще триває, нове не запускається.
+        """
+        if self._contacts is None or self._file is None:
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._raise_compact_error()
+
+        with self._lock:
+            self._flush_locked()
+            self._file.close()
+            self._generation += 1
+            self._entries = 0
+            self._file = open(self._journal_path(self._generation), "a", encoding="utf-8")
+        _fsync_directory(self.directory)
+
+        file = self._write_snapshot(self._generation)
+        self._compactor = threading.Thread(
+            target=self._publish_snapshot, args=(self._generation, file),
+            name="contact-journal-compactor", daemon=True,
+        )
+        self._compactor.start()
+
+    def _write_snapshot(self, generation: int) -> TextIO:
+        """
+        Записує знімок книги у тимчасовий файл, не копіюючи книгу.
+
+        Returns:
+            TextIO: Відкритий тимчасовий файл, ще без fsync
+        """
+        encode = json.encoder.encode_basestring
+        file = open(os.path.join(self.directory, SNAPSHOT_NAME + ".tmp"), "w", encoding="utf-8")
+        try:
+            file.write(json.dumps({"generation": generation}) + "\n")
+            file.writelines(f"[{encode(name)}, {encode(phone)}]\n"
+                            for name, phone in self._contacts.items())
+            file.flush()
+        except BaseException:
+            file.close()
+            raise
+        return file
+
+    def _publish_snapshot(self, generation: int, file: TextIO) -> None:
+        """Робить fsync знімка, атомарно замінює ним попередній і видаляє покриті журнали."""
+        try:
+            with file:
+                os.fsync(file.fileno())
+            path = os.path.join(self.directory, SNAPSHOT_NAME)
+            os.replace(file.name, path)
+            _fsync_directory(self.directory)
+
+            for old_generation in self._journal_generations():
+                if old_generation < generation:
+                    os.remove(self._journal_path(old_generation))
+        except BaseException as e:
+            self._compact_error = e
+
+    def _raise_compact_error(self) -> None:
+        """Повідомляє про помилку фонового компактування в основному потоці."""
+        if self._compact_error is not None:
+            error, self._compact_error = self._compact_error, None
+            raise error
+
+    def close(self) -> None:
+        """Скидає останній пакет, чекає завершення компактування та закриває журнал."""
+        if self._file is None:
+            return
+        self._stop_flusher.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            self._flush_locked()
+            self._file.close()
+            self._file = None
+        if self._compactor is not None:
+            self._compactor.join()
+        if self._contacts is not None:
+            self._contacts.journal = None
+            self._contacts = None
+        self._raise_compact_error()
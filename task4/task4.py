@@ -6,11 +6,40 @@
 - Декоратор input_error для обробки помилок введення користувача
 - Обробку винятків KeyError, ValueError, IndexError
 - Зрозумілі повідомлення про помилки без завершення програми
+- Індекс триграм для швидкого пошуку контактів за підрядком
+- Відсортований за іменем список контактів з посторінковим виводом
+- Збереження контактів на диск через журнал та знімки (модуль storage)
+- Пакетний режим: виконання команд з файлу або stdin
+- Масовий імпорт та експорт контактів у CSV та JSON lines
+- Нормалізація телефонів та пошук контакту за номером (whois)
+- Компактне сховище для дуже великих книг (модуль compact)
+- Метрики команд: кількість викликів, помилки та гістограми затримок
+
+Використання:
+    python task4.py
+    python task4.py --data contacts_db
+    python task4.py --batch test_input.txt
+    python task4.py --batch - --output results.txt < test_input.txt
+    python task4.py --store compact --batch migration.txt
+    python task4.py --metrics-dump metrics.json --batch migration.txt
 """
 
 from __future__ import annotations
-from typing import Dict, Tuple, Callable, Any
+from typing import (Dict, Tuple, Callable, Any, Iterable, Iterator, List, MutableMapping,
+                    Optional, Set, TextIO)
+from collections import abc
+import argparse
+import bisect
+import contextlib
+import csv
 import functools
+import itertools
+import json
+import os
+import sys
+import time
+
+from phones import DEFAULT_COUNTRY_CODE, TRUNK_PREFIX, normalize_phone
 
 
 def input_error(func: Callable) -> Callable:
@@ -33,10 +62,12 @@ def input_error(func: Callable) -> Callable:
         try:
             return func(*args, **kwargs)
         except KeyError as e:
+            _note_error(e)
             # Обробка випадку, коли контакт не знайдено
             contact_name = str(e).strip("'\"")
             return f"Contact '{contact_name}' not found."
         except ValueError as e:
+            _note_error(e)
             # Обробка різних випадків ValueError
             error_msg = str(e).lower()
             
@@ -49,18 +80,570 @@ def input_error(func: Callable) -> Callable:
             else:
                 return "Invalid format. Please check your input."
         except IndexError as e:
+            _note_error(e)
             # Обробка випадку недостатньої кількості аргументів
             error_msg = str(e).lower()
             if "search query" in error_msg:
                 return "Enter search query"
             return "Enter the argument for the command"
         except Exception as e:
+            _note_error(e)
             # Загальна обробка інших помилок
             return f"An error occurred: {str(e)}"
     
     return inner
 
 
+# -------------------- Метрики команд --------------------
+
+# Кількість log2-кошиків гістограми: кошик b містить затримки з
+# ns.bit_length() == b, тобто [2^(b-1), 2^b) нс; останній - усе довше
+LATENCY_BUCKETS = 48
+
+
+class CommandMetrics:
+    """
+    Лічильники викликів, помилок та гістограми затримок для кожної команди.
+    
+    Гістограма має фіксовану кількість логарифмічних кошиків, тож пам'ять
+    не залежить від кількості викликів. Помилки, які input_error перетворює
+    на повідомлення, реєструються за типом винятку.
+    
+    Метрики збираються лише після enable_metrics(); інакше обробники
+    не обгортаються і додаткових витрат немає.
+    """
+    
+    def __init__(self) -> None:
+        self.calls: Dict[str, int] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+        self.total_ns: Dict[str, int] = {}
+        self.max_ns: Dict[str, int] = {}
+        self.histograms: Dict[str, List[int]] = {}
+        # Тип винятку, перехопленого input_error під час поточної команди
+        self.pending_error: Optional[str] = None
+    
+    def record(self, command: str, elapsed_ns: int) -> None:
+        """
+        Реєструє один виклик команди.
+        
+        Args:
+            command (str): Назва команди
+            elapsed_ns (int): Тривалість виклику в наносекундах
+        """
+        histogram = self.histograms.get(command)
+        if histogram is None:
+            histogram = self.histograms[command] = [0] * LATENCY_BUCKETS
+            self.calls[command] = 0
+            self.total_ns[command] = 0
+            self.max_ns[command] = 0
+        histogram[min(elapsed_ns.bit_length(), LATENCY_BUCKETS - 1)] += 1
+        self.calls[command] += 1
+        self.total_ns[command] += elapsed_ns
+        if elapsed_ns > self.max_ns[command]:
+            self.max_ns[command] = elapsed_ns
+        
+        if self.pending_error is not None:
+            errors = self.errors.setdefault(command, {})
+            errors[self.pending_error] = errors.get(self.pending_error, 0) + 1
+            self.pending_error = None
+    
+    def percentile_ns(self, command: str, fraction: float) -> int:
+        """
+        Оцінює перцентиль затримки як верхню межу відповідного кошика.
+        
+        Args:
+            command (str): Назва команди
+            fraction (float): Частка викликів, наприклад 0.99
+            
+        Returns:
+            int: Верхня межа затримки в наносекундах
+        """
+        histogram = self.histograms[command]
+        threshold = fraction * self.calls[command]
+        seen = 0
+        for bucket, count in enumerate(histogram):
+            seen += count
+            if seen >= threshold and count:
+                return min(1 << bucket, self.max_ns[command])
+        return self.max_ns[command]
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Повертає метрики у вигляді, придатному для JSON.
+        
+        Returns:
+            Dict[str, Any]: Команда -> лічильники, помилки та непорожні кошики
+            гістограми (верхня межа в нс -> кількість)
+        """
+        return {
+            command: {
+                "calls": self.calls[command],
+                "errors": dict(self.errors.get(command, {})),
+                "total_ns": self.total_ns[command],
+                "max_ns": self.max_ns[command],
+                "p50_ns": self.percentile_ns(command, 0.5),
+                "p99_ns": self.percentile_ns(command, 0.99),
+                "histogram": {str(1 << bucket): count
+                              for bucket, count in enumerate(histogram) if count},
+            }
+            for command, histogram in sorted(self.histograms.items())
+        }
+    
+    def report(self) -> str:
+        """
+        Формує текстову таблицю метрик.
+        
+        Returns:
+            str: Відформатована таблиця
+        """
+        if not self.calls:
+            return "No commands recorded yet."
+        
+        lines = [f"{'Command':<10} {'Calls':>8} {'Errors':>7} {'Mean':>10} "
+                 f"{'p50':>10} {'p99':>10} {'Max':>10}"]
+        for command in sorted(self.calls):
+            calls = self.calls[command]
+            errors = self.errors.get(command, {})
+            lines.append(
+                f"{command:<10} {calls:>8} {sum(errors.values()):>7} "
+                f"{_format_ns(self.total_ns[command] // calls):>10} "
+                f"{_format_ns(self.percentile_ns(command, 0.5)):>10} "
+                f"{_format_ns(self.percentile_ns(command, 0.99)):>10} "
+                f"{_format_ns(self.max_ns[command]):>10}"
+            )
+            for error_type, count in sorted(errors.items()):
+                lines.append(f"  {error_type}: {count}")
+        return "\n".join(lines)
+
+
+def _format_ns(value: int) -> str:
+    """Форматує наносекунди в зручних одиницях."""
+    if value < 1_000:
+        return f"{value} ns"
+    if value < 1_000_000:
+        return f"{value / 1_000:.1f} us"
+    if value < 1_000_000_000:
+        return f"{value / 1_000_000:.1f} ms"
+    return f"{value / 1_000_000_000:.2f} s"
+
+
+# Активні метрики (None - метрики вимкнені)
+_active_metrics: Optional[CommandMetrics] = None
+
+
+def enable_metrics() -> CommandMetrics:
+    """
+    Вмикає збір метрик для командних мап, створених після виклику.
+    
+    Returns:
+        CommandMetrics: Активні метрики
+    """
+    global _active_metrics
+    if _active_metrics is None:
+        _active_metrics = CommandMetrics()
+    return _active_metrics
+
+
+def _note_error(error: Exception) -> None:
+    """Запам'ятовує тип винятку, перехопленого input_error, для метрик."""
+    if _active_metrics is not None:
+        _active_metrics.pending_error = type(error).__name__
+
+
+def _timed(command: str, handler: Callable[..., str],
+           metrics: CommandMetrics) -> Callable[..., str]:
+    """Обгортає обробник команди виміром затримки."""
+    def timed(*args: Any) -> str:
+        metrics.pending_error = None
+        start = time.perf_counter_ns()
+        try:
+            return handler(*args)
+        finally:
+            metrics.record(command, time.perf_counter_ns() - start)
+    return timed
+
+
+# -------------------- Адресна книга --------------------
+
+# Довжина n-грам у пошуковому індексі
+NGRAM_SIZE = 3
+
+
+def _ngrams(text: str) -> Set[str]:
+    """
+    Повертає множину n-грам рядка.
+    
+    Рядки, коротші за NGRAM_SIZE, індексуються цілком, щоб їх теж
+    можна було знайти через індекс.
+    
+    Args:
+        text (str): Рядок для розбиття
+        
+    Returns:
+        Set[str]: Множина n-грам
+    """
+    if len(text) <= NGRAM_SIZE:
+        return {text} if text else set()
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def _contact_ngrams(name: str, phone: str) -> Set[str]:
+    """
+    Повертає n-грами контакту: імені без урахування регістру та телефону.
+    """
+    return _ngrams(name.lower()) | _ngrams(phone)
+
+
+# Пакет, не менший за 1/BULK_REBUILD_RATIO книги, перебудовує індекси цілком
+BULK_REBUILD_RATIO = 4
+
+
+def sort_key(name: str) -> str:
+    """
+    Ключ сортування контактів: ім'я без урахування регістру.
+    """
+    return name.casefold()
+
+
+class ContactBook(abc.MutableMapping):
+    """
+    Адресна книга з інвертованим індексом n-грам для пошуку за підрядком.
+    
+    Поводиться як звичайний словник ім'я -> телефон, тому обробники команд
+    працюють з нею так само, як з Dict[str, str]. Індекс та відсортований
+    за sort_key список імен оновлюються інкрементально при кожному
+    додаванні, зміні та видаленні контакту.
+    
+    Окремий хеш-індекс зводить нормалізований телефон (normalize_phone)
+    до імен контактів, тож пошук за номером виконується за O(1).
+    
+    Масове додавання (add_many) не оновлює індекс та відсортований список
+    по одному контакту, а позначає їх застарілими; вони перебудовуються
+    один раз при першому пошуку чи виводі.
+    
+    Запити, коротші за NGRAM_SIZE, індекс не звужує (їм відповідає надто
+    велика частина книги), тому вони виконуються повним переглядом.
+    
+    Якщо задано атрибут journal (див. storage.ContactJournal), кожна зміна
+    книги також записується в журнал.
+    
+    Example:
+        >>> book = ContactBook({"John": "0501234567"})
+        >>> book.search("123")
+        [('John', '0501234567')]
+    """
+    
+    def __init__(self, data: Any = None) -> None:
+        self._data: Dict[str, str] = {}
+        # n-грама -> множина імен контактів, що її містять
+        self._index: Dict[str, Set[str]] = {}
+        # Порядок додавання, щоб результати пошуку збігалися з порядком словника
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        # Записи (ключ сортування, порядок додавання, ім'я) у порядку сортування
+        self._sorted: List[Tuple[str, int, str]] = []
+        # Нормалізований телефон -> імена контактів з цим номером; кортежі
+        # замість списків, щоб мільйони значень не відстежувалися збирачем сміття
+        self._phones: Dict[str, Tuple[str, ...]] = {}
+        # Індекс та список застаріли після масового додавання
+        self._index_stale = False
+        self._sorted_stale = False
+        # Журнал змін для збереження на диск (None - книга лише в пам'яті)
+        self.journal: Any = None
+        if data:
+            self.update(data)
+    
+    def __getitem__(self, name: str) -> str:
+        return self._data[name]
+    
+    def __setitem__(self, name: str, phone: str) -> None:
+        old_phone = self._data.get(name)
+        if old_phone is None:
+            self._order[name] = self._next_order
+            if not self._sorted_stale:
+                bisect.insort(self._sorted, (sort_key(name), self._next_order, name))
+            self._next_order += 1
+        else:
+            self._unlink_phone(name, old_phone)
+        self._link_phone(name, phone)
+        
+        if not self._index_stale:
+            old_grams = _contact_ngrams(name, old_phone) if old_phone is not None else set()
+            new_grams = _contact_ngrams(name, phone)
+            self._unindex(name, old_grams - new_grams)
+            for gram in new_grams - old_grams:
+                self._index.setdefault(gram, set()).add(name)
+        self._data[name] = phone
+        if self.journal is not None:
+            self.journal.record_set(name, phone)
+    
+    def __delitem__(self, name: str) -> None:
+        phone = self._data.pop(name)
+        order = self._order.pop(name)
+        self._unlink_phone(name, phone)
+        if not self._sorted_stale:
+            entry = (sort_key(name), order, name)
+            del self._sorted[bisect.bisect_left(self._sorted, entry)]
+        if not self._index_stale:
+            self._unindex(name, _contact_ngrams(name, phone))
+        if self.journal is not None:
+            self.journal.record_delete(name)
+    
+    def __contains__(self, name: object) -> bool:
+        return name in self._data
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+    
+    def to_dict(self) -> Dict[str, str]:
+        """
+        Повертає копію контактів у вигляді звичайного словника.
+        """
+        return dict(self._data)
+    
+    def update(self, other: Any = (), **kwargs: str) -> None:
+        """
+        Додає або змінює контакти з іншого словника чи пар (ім'я, телефон).
+        
+        Великий пакет не вставляється у відсортований список та індекс
+        поштучно: вони перебудовуються одним проходом при першому
+        використанні, як після add_many.
+        """
+        if isinstance(other, abc.Mapping):
+            pairs = list(other.items())
+        elif hasattr(other, "keys"):
+            pairs = [(name, other[name]) for name in other.keys()]
+        else:
+            pairs = list(other)
+        pairs.extend(kwargs.items())
+        
+        self._begin_bulk(len(pairs))
+        for name, phone in pairs:
+            self[name] = phone
+    
+    def _begin_bulk(self, count: int) -> bool:
+        """
+        Позначає індекс та відсортований список застарілими перед пакетом
+        з count контактів, якщо перебудова дешевша за поштучне оновлення.
+        
+        Returns:
+            bool: True, якщо індекси перебудовуватимуться цілком
+        """
+        if count * BULK_REBUILD_RATIO >= len(self._data) or self._index_stale or self._sorted_stale:
+            self._index_stale = True
+            self._sorted_stale = True
+            return True
+        return False
+    
+    def add_many(self, pairs: Iterable[Tuple[str, str]]) -> Tuple[List[str], List[str]]:
+        """
+        Додає пакет нових контактів, пропускаючи вже наявні імена.
+        
+        Якщо пакет порівнянний з розміром книги, індекс та відсортований
+        список не оновлюються поштучно, а перебудовуються пізніше одним
+        проходом. Індекс телефонів оновлюється завжди.
+        
+        Args:
+            pairs: Пари (ім'я, телефон)
+            
+        Returns:
+            Tuple[List[str], List[str]]: Імена, що вже були в книзі або
+            повторились у пакеті, та імена доданих контактів, номер яких
+            уже належить іншому контакту
+        """
+        pairs = list(pairs)
+        duplicates = []
+        shared_phones = []
+        
+        with _batched_journal(self) as added:
+            if not self._begin_bulk(len(pairs)):
+                # Невеликий пакет: поштучне оновлення дешевше за перебудову
+                for name, phone in pairs:
+                    if name in self._data:
+                        duplicates.append(name)
+                        continue
+                    self[name] = phone
+                    added.append((name, phone))
+                    if len(self._phones.get(normalize_phone(phone), ())) > 1:
+                        shared_phones.append(name)
+                return duplicates, shared_phones
+            
+            data = self._data
+            order = self._order
+            next_order = self._next_order
+            for name, phone in pairs:
+                if name in data:
+                    duplicates.append(name)
+                    continue
+                data[name] = phone
+                order[name] = next_order
+                next_order += 1
+                added.append((name, phone))
+                if self._link_phone(name, phone):
+                    shared_phones.append(name)
+            self._next_order = next_order
+        return duplicates, shared_phones
+    
+    def phone_owners(self, phone: str) -> List[str]:
+        """
+        Повертає імена контактів з тим самим нормалізованим номером.
+        
+        Args:
+            phone (str): Телефон у довільному форматі
+            
+        Returns:
+            List[str]: Імена у порядку додавання номера
+        """
+        return list(self._phones.get(normalize_phone(phone), ()))
+    
+    def _link_phone(self, name: str, phone: str) -> bool:
+        """
+        Додає контакт до індексу телефонів.
+        
+        Returns:
+            bool: True, якщо номер уже належав іншому контакту
+        """
+        key = normalize_phone(phone)
+        if not key:
+            return False
+        owners = self._phones.get(key)
+        if owners is None:
+            self._phones[key] = (name,)
+            return False
+        self._phones[key] = owners + (name,)
+        return True
+    
+    def _unlink_phone(self, name: str, phone: str) -> None:
+        """Прибирає контакт з індексу телефонів."""
+        key = normalize_phone(phone)
+        owners = self._phones.get(key)
+        if owners is None:
+            return
+        owners = tuple(other for other in owners if other != name)
+        if owners:
+            self._phones[key] = owners
+        else:
+            del self._phones[key]
+    
+    def _ensure_sorted(self) -> None:
+        """Перебудовує відсортований список, якщо він застарів."""
+        if self._sorted_stale:
+            order = self._order
+            self._sorted = sorted((sort_key(name), order[name], name) for name in self._data)
+            self._sorted_stale = False
+    
+    def _ensure_index(self) -> None:
+        """Перебудовує індекс n-грам, якщо він застарів."""
+        if self._index_stale:
+            index: Dict[str, Set[str]] = {}
+            for name, phone in self._data.items():
+                for gram in _contact_ngrams(name, phone):
+                    names = index.get(gram)
+                    if names is None:
+                        index[gram] = {name}
+                    else:
+                        names.add(name)
+            self._index = index
+            self._index_stale = False
+    
+    def sorted_items(self, offset: int = 0,
+                     limit: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Повертає контакти у порядку sort_key без повного сортування.
+        
+        Args:
+            offset (int): Кількість контактів, які треба пропустити
+            limit (Optional[int]): Максимальна кількість контактів або None
+            
+        Yields:
+            Tuple[str, str]: Пари (ім'я, телефон)
+        """
+        self._ensure_sorted()
+        stop = len(self._sorted) if limit is None else min(len(self._sorted), offset + limit)
+        for i in range(offset, stop):
+            name = self._sorted[i][2]
+            yield name, self._data[name]
+    
+    def _unindex(self, name: str, grams: Set[str]) -> None:
+        """Прибирає ім'я з posting-списків вказаних n-грам."""
+        for gram in grams:
+            names = self._index[gram]
+            names.discard(name)
+            if not names:
+                del self._index[gram]
+    
+    def _candidates(self, query: str) -> Set[str]:
+        """
+        Повертає надмножину контактів, що можуть містити запит.
+        
+        Перетинаються posting-списки n-грам запиту; запит має бути
+        не коротшим за NGRAM_SIZE.
+        """
+        self._ensure_index()
+        postings = []
+        for gram in _ngrams(query):
+            names = self._index.get(gram)
+            if not names:
+                return set()
+            postings.append(names)
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+    
+    def search(self, query: str) -> List[Tuple[str, str]]:
+        """
+        Шукає контакти, ім'я (у нижньому регістрі) або телефон яких містить запит.
+        
+        Результат збігається з послідовним переглядом словника: ті самі
+        контакти в тому самому порядку.
+        
+        Args:
+            query (str): Пошуковий запит
+            
+        Returns:
+            List[Tuple[str, str]]: Пари (ім'я, телефон)
+        """
+        data = self._data
+        if len(query) < NGRAM_SIZE:
+            # Словник зберігає порядок додавання, тож перегляд дає той самий порядок
+            return [(name, phone) for name, phone in data.items()
+                    if query in name.lower() or query in phone]
+        
+        matches = [
+            name for name in self._candidates(query)
+            if query in name.lower() or query in data[name]
+        ]
+        matches.sort(key=self._order.__getitem__)
+        return [(name, data[name]) for name in matches]
+
+
+@contextlib.contextmanager
+def _batched_journal(contacts: MutableMapping[str, str]) -> Iterator[List[Tuple[str, str]]]:
+    """
+    Відключає журнал сховища на час пакета додавань і записує додані
+    контакти в журнал одним записом (один fsync) після пакета.
+    
+    Yields:
+        List[Tuple[str, str]]: Список, у який пакет додає записані контакти
+    """
+    added: List[Tuple[str, str]] = []
+    journal = getattr(contacts, "journal", None)
+    if journal is None:
+        yield added
+        return
+    contacts.journal = None
+    try:
+        yield added
+    finally:
+        contacts.journal = journal
+        journal.record_set_many(added)
+
+
 # -------------------- Парсер команд --------------------
 
 def parse_input(user_input: str) -> Tuple[str, ...]:
@@ -87,8 +670,40 @@ def parse_input(user_input: str) -> Tuple[str, ...]:
 
 # -------------------- Обробники команд --------------------
 
+def phone_owners(contacts: MutableMapping[str, str], phone: str) -> List[str]:
+    """
+    Повертає імена контактів, чий телефон збігається з вказаним після нормалізації.
+    
+    Сховища з індексом телефонів (ContactBook, CompactContactStore) відповідають
+    через власний метод phone_owners; звичайний словник переглядається.
+    
+    Args:
+        contacts: Словник контактів
+        phone: Телефон у довільному форматі
+        
+    Returns:
+        List[str]: Імена контактів
+    """
+    indexed_owners = getattr(contacts, "phone_owners", None)
+    if indexed_owners is not None:
+        return indexed_owners(phone)
+    
+    key = normalize_phone(phone)
+    if not key:
+        return []
+    return [name for name, other in contacts.items() if normalize_phone(other) == key]
+
+
+def _shared_phone_note(contacts: MutableMapping[str, str], name: str, phone: str) -> str:
+    """Повертає попередження, якщо номер уже належить іншим контактам."""
+    others = [other for other in phone_owners(contacts, phone) if other != name]
+    if not others:
+        return ""
+    return f"\nWarning: phone {phone} is also used by {', '.join(others)}."
+
+
 @input_error
-def add_contact(args: Tuple[str, ...], contacts: Dict[str, str]) -> str:
+def add_contact(args: Tuple[str, ...], contacts: MutableMapping[str, str]) -> str:
     """
     Додає новий контакт до адресної книги.
     
@@ -116,11 +731,11 @@ def add_contact(args: Tuple[str, ...], contacts: Dict[str, str]) -> str:
         return f"Contact '{name}' already exists. Use 'change' to update."
     
     contacts[name] = phone
-    return "Contact added."
+    return "Contact added." + _shared_phone_note(contacts, name, phone)
 
 
 @input_error
-def change_contact(args: Tuple[str, ...], contacts: Dict[str, str]) -> str:
+def change_contact(args: Tuple[str, ...], contacts: MutableMapping[str, str]) -> str:
     """
     Змінює телефон існуючого контакту.
     
@@ -150,11 +765,12 @@ def change_contact(args: Tuple[str, ...], contacts: Dict[str, str]) -> str:
     
     old_phone = contacts[name]
     contacts[name] = phone
-    return f"Contact '{name}' updated from {old_phone} to {phone}."
+    return (f"Contact '{name}' updated from {old_phone} to {phone}."
+            + _shared_phone_note(contacts, name, phone))
 
 
 @input_error
-def show_phone(args: Tuple[str, ...], contacts: Dict[str, str]) -> str:
+def show_phone(args: Tuple[str, ...], contacts: MutableMapping[str, str]) -> str:
     """
     Показує телефон конкретного контакту.
     
@@ -184,29 +800,83 @@ def show_phone(args: Tuple[str, ...], contacts: Dict[str, str]) -> str:
     return f"{name}: {contacts[name]}"
 
 
+def iter_sorted_contacts(contacts: MutableMapping[str, str], offset: int = 0,
+                         limit: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Повертає сторінку контактів, відсортованих за іменем без урахування регістру.
+    
+    ContactBook підтримує порядок інкрементально; звичайний словник
+    сортується при кожному виклику.
+    
+    Args:
+        contacts: Словник контактів
+        offset (int): Кількість контактів, які треба пропустити
+        limit (Optional[int]): Максимальна кількість контактів або None
+        
+    Returns:
+        Iterator[Tuple[str, str]]: Пари (ім'я, телефон)
+    """
+    if isinstance(contacts, ContactBook):
+        return contacts.sorted_items(offset, limit)
+    
+    sorted_contacts = sorted(contacts.items(), key=lambda x: sort_key(x[0]))
+    stop = None if limit is None else offset + limit
+    return itertools.islice(sorted_contacts, offset, stop)
+
+
 @input_error
-def show_all(contacts: Dict[str, str]) -> str:
+def show_all(args: Tuple[str, ...], contacts: MutableMapping[str, str],
+             out: Optional[TextIO] = None, page_limit: Optional[int] = None) -> str:
     """
-    Показує всі контакти в адресній книзі.
+    Показує контакти в адресній книзі, за потреби посторінково.
     
     Args:
+        args: Кортеж з необов'язковими зміщенням та кількістю контактів
         contacts: Словник контактів
+        out: Потік для потокового виводу; якщо None, повертається один рядок
+        page_limit: Найбільший розмір сторінки або None; довший список
+            обрізається з підказкою, як отримати наступну сторінку
         
     Returns:
-        str: Відформатований список всіх контактів
+        str: Відформатований список контактів, або порожній рядок,
+        якщо контакти вже записано в out
+        
+    Raises:
+        ValueError: Якщо зміщення чи кількість не є невід'ємними цілими числами
     """
+    offset = int(args[0]) if len(args) > 0 else 0
+    limit = int(args[1]) if len(args) > 1 else None
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("offset and limit must be non-negative")
+    
     if not contacts:
         return "No contacts found."
     
-    # Сортуємо контакти за іменем (без урахування регістру)
-    sorted_contacts = sorted(contacts.items(), key=lambda x: x[0].lower())
-    lines = [f"{name}: {phone}" for name, phone in sorted_contacts]
+    next_page = ""
+    if page_limit is not None and (limit is None or limit > page_limit):
+        limit = page_limit
+        if offset + limit < len(contacts):
+            next_page = (f"Showing {limit} contacts from {offset}; "
+                         f"use 'all {offset + limit} {limit}' for the next page.")
+    
+    lines = (f"{name}: {phone}" for name, phone in iter_sorted_contacts(contacts, offset, limit))
+    
+    if out is None:
+        result = "\n".join(itertools.chain(lines, [next_page] if next_page else []))
+        return result or "No contacts on this page."
     
-    return "\n".join(lines)
+    # Потоковий вивід: рядки пишуться по одному, без побудови великого рядка
+    written = 0
+    for line in lines:
+        out.write(line + "\n")
+        written += 1
+    if not written:
+        return "No contacts on this page."
+    return next_page
 
 
 @input_error
-def delete_contact(args: Tuple[str, ...], contacts: Dict[str, str]) -> str:
+def delete_contact(args: Tuple[str, ...], contacts: MutableMapping[str, str]) -> str:
     """
     Видаляє контакт з адресної книги.
     
@@ -238,13 +908,42 @@ def delete_contact(args: Tuple[str, ...], contacts: Dict[str, str]) -> str:
 
 
 @input_error
-def search_contacts(args: Tuple[str, ...], contacts: Dict[str, str]) -> str:
+def whois(args: Tuple[str, ...], contacts: MutableMapping[str, str]) -> str:
+    """
+    Знаходить контакти за номером телефону в будь-якому форматі.
+    
+    Args:
+        args: Кортеж з номером телефону
+        contacts: Словник контактів
+        
+    Returns:
+        str: Контакти з цим номером
+        
+    Raises:
+        IndexError: Якщо не вказано номер
+    """
+    if len(args) < 1:
+        raise IndexError("phone number required")
+    
+    phone = args[0]
+    owners = phone_owners(contacts, phone)
+    
+    if not owners:
+        return f"No contacts found with phone '{phone}'"
+    
+    return "\n".join(f"{name}: {contacts[name]}" for name in owners)
+
+
+@input_error
+def search_contacts(args: Tuple[str, ...], contacts: MutableMapping[str, str],
+                    max_results: Optional[int] = None) -> str:
     """
     Шукає контакти за частиною імені або телефону.
     
     Args:
         args: Кортеж з пошуковим запитом
         contacts: Словник контактів
+        max_results: Найбільша кількість показаних контактів або None
         
     Returns:
         str: Результати пошуку
@@ -260,28 +959,330 @@ def search_contacts(args: Tuple[str, ...], contacts: Dict[str, str]) -> str:
     if not query.strip():
         raise IndexError("search query required")
     
-    # Шукаємо в іменах та телефонах
-    matches = []
-    for name, phone in contacts.items():
-        if query in name.lower() or query in phone:
-            matches.append(f"{name}: {phone}")
+    # Шукаємо в іменах та телефонах: через індекс або повним переглядом
+    if isinstance(contacts, ContactBook):
+        matches = [f"{name}: {phone}" for name, phone in contacts.search(query)]
+    else:
+        matches = []
+        for name, phone in contacts.items():
+            if query in name.lower() or query in phone:
+                matches.append(f"{name}: {phone}")
     
     if not matches:
         return f"No contacts found matching '{query}'"
     
+    if max_results is not None and len(matches) > max_results:
+        return (f"Found {len(matches)} contact(s), showing the first {max_results}:\n"
+                + "\n".join(matches[:max_results]))
     return f"Found {len(matches)} contact(s):\n" + "\n".join(matches)
 
 
+# -------------------- Масовий імпорт та експорт --------------------
+
+# Кількість рядків файлу, що валідуються та додаються одним пакетом
+IMPORT_BATCH_SIZE = 50_000
+
+# Скільки прикладів дублікатів та помилкових рядків показувати у звіті
+SUMMARY_SAMPLE_SIZE = 10
+
+# Розмір буфера файлів імпорту та експорту
+BULK_BUFFER_SIZE = 1 << 20
+
+
+def _file_format(path: str) -> str:
+    """
+    Визначає формат файлу контактів за розширенням.
+    
+    Raises:
+        ValueError: Якщо формат не підтримується
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"unsupported file format '{suffix}'")
+
+
+def _read_rows(file: TextIO, file_format: str) -> Iterator[Tuple[int, Any, Any]]:
+    """
+    Читає рядки файлу контактів без валідації значень.
+    
+    Yields:
+        Tuple[int, Any, Any]: (номер рядка, ім'я, телефон); для рядків
+        з неправильною структурою ім'я та телефон - None
+    """
+    if file_format == "csv":
+        reader = csv.reader(file)
+        for row in reader:
+            if reader.line_num == 1 and [cell.strip().lower() for cell in row] == ["name", "phone"]:
+                continue
+            if not row:
+                continue
+            if len(row) == 2:
+                yield reader.line_num, row[0], row[1]
+            else:
+                yield reader.line_num, None, None
+        return
+    
+    for line_num, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            yield line_num, record.get("name"), record.get("phone")
+        except (ValueError, AttributeError):
+            yield line_num, None, None
+
+
+def _is_token(value: Any) -> bool:
+    """Перевіряє, що значення - непорожній рядок без пробілів, як аргумент команди."""
+    return isinstance(value, str) and value.split() == [value]
+
+
+class ImportSummary:
+    """
+    Підсумок масового імпорту: кількість доданих, дублікатів та помилкових рядків.
+    
+    Замість окремого повідомлення на кожен рядок зберігає лише лічильники
+    та перші SUMMARY_SAMPLE_SIZE прикладів.
+    """
+    
+    def __init__(self) -> None:
+        self.imported = 0
+        self.duplicates = 0
+        self.duplicate_names: List[str] = []
+        self.invalid = 0
+        self.invalid_lines: List[int] = []
+        self.shared_phones = 0
+        self.shared_phone_names: List[str] = []
+    
+    def add_duplicates(self, names: List[str]) -> None:
+        self.duplicates += len(names)
+        free = SUMMARY_SAMPLE_SIZE - len(self.duplicate_names)
+        self.duplicate_names.extend(names[:max(free, 0)])
+    
+    def add_shared_phones(self, names: List[str]) -> None:
+        self.shared_phones += len(names)
+        free = SUMMARY_SAMPLE_SIZE - len(self.shared_phone_names)
+        self.shared_phone_names.extend(names[:max(free, 0)])
+    
+    def add_invalid(self, line_num: int) -> None:
+        self.invalid += 1
+        if len(self.invalid_lines) < SUMMARY_SAMPLE_SIZE:
+            self.invalid_lines.append(line_num)
+    
+    def report(self) -> str:
+        """
+        Формує текстовий звіт про імпорт.
+        
+        Returns:
+            str: Звіт
+        """
+        lines = [f"Imported {self.imported} contact(s)."]
+        if self.duplicates:
+            sample = ", ".join(self.duplicate_names)
+            more = ", ..." if self.duplicates > len(self.duplicate_names) else ""
+            lines.append(f"Skipped {self.duplicates} duplicate name(s): {sample}{more}")
+        if self.invalid:
+            sample = ", ".join(map(str, self.invalid_lines))
+            more = ", ..." if self.invalid > len(self.invalid_lines) else ""
+            lines.append(f"Skipped {self.invalid} invalid row(s) at line(s): {sample}{more}")
+        if self.shared_phones:
+            sample = ", ".join(self.shared_phone_names)
+            more = ", ..." if self.shared_phones > len(self.shared_phone_names) else ""
+            lines.append(f"Warning: {self.shared_phones} imported contact(s) share a phone "
+                         f"with another contact: {sample}{more}")
+        return "\n".join(lines)
+
+
+def import_contacts(contacts: MutableMapping[str, str], path: str) -> ImportSummary:
+    """
+    Імпортує контакти з CSV (name,phone) або JSON lines ({"name": ..., "phone": ...}).
+    
+    Файл читається потоково пакетами по IMPORT_BATCH_SIZE рядків. Наявні
+    контакти не змінюються: імена, що вже є в книзі або повторюються
+    у файлі, потрапляють у підсумок як дублікати.
+    
+    Args:
+        contacts: Книга контактів
+        path: Шлях до файлу .csv, .jsonl або .ndjson
+        
+    Returns:
+        ImportSummary: Підсумок імпорту
+        
+    Raises:
+        ValueError: Якщо формат файлу не підтримується
+    """
+    file_format = _file_format(path)
+    summary = ImportSummary()
+    
+    # Для сховищ без індексу телефонів номери підраховуються один раз на імпорт,
+    # а не переглядом усієї книги для кожного нового контакту
+    phone_counts: Optional[Dict[str, int]] = None
+    if not isinstance(contacts, ContactBook) and not hasattr(contacts, "phone_owners"):
+        phone_counts = {}
+        for phone in contacts.values():
+            key = normalize_phone(phone)
+            phone_counts[key] = phone_counts.get(key, 0) + 1
+    
+    with open(path, "r", encoding="utf-8", newline="", buffering=BULK_BUFFER_SIZE) as file:
+        rows = _read_rows(file, file_format)
+        while True:
+            batch = list(itertools.islice(rows, IMPORT_BATCH_SIZE))
+            if not batch:
+                break
+            
+            valid = []
+            for line_num, name, phone in batch:
+                if isinstance(name, str) and isinstance(phone, str):
+                    name, phone = name.strip(), phone.strip()
+                if _is_token(name) and _is_token(phone):
+                    valid.append((name, phone))
+                else:
+                    summary.add_invalid(line_num)
+            
+            if isinstance(contacts, ContactBook):
+                duplicates, shared_phones = contacts.add_many(valid)
+            else:
+                duplicates, shared_phones = [], []
+                with _batched_journal(contacts) as added:
+                    for name, phone in valid:
+                        if name in contacts:
+                            duplicates.append(name)
+                            continue
+                        contacts[name] = phone
+                        added.append((name, phone))
+                        if phone_counts is None:
+                            shared = len(contacts.phone_owners(phone)) > 1
+                        else:
+                            key = normalize_phone(phone)
+                            phone_counts[key] = phone_counts.get(key, 0) + 1
+                            shared = bool(key) and phone_counts[key] > 1
+                        if shared:
+                            shared_phones.append(name)
+            summary.imported += len(valid) - len(duplicates)
+            summary.add_duplicates(duplicates)
+            summary.add_shared_phones(shared_phones)
+    
+    return summary
+
+
+def export_contacts(contacts: MutableMapping[str, str], path: str) -> int:
+    """
+    Експортує контакти у CSV або JSON lines у порядку додавання.
+    
+    Рядки пишуться потоково, без побудови повного списку в пам'яті.
+    
+    Args:
+        contacts: Книга контактів
+        path: Шлях до файлу .csv, .jsonl або .ndjson
+        
+    Returns:
+        int: Кількість експортованих контактів
+        
+    Raises:
+        ValueError: Якщо формат файлу не підтримується
+    """
+    file_format = _file_format(path)
+    
+    with open(path, "w", encoding="utf-8", newline="", buffering=BULK_BUFFER_SIZE) as file:
+        if file_format == "csv":
+            writer = csv.writer(file)
+            writer.writerow(("name", "phone"))
+            writer.writerows(contacts.items())
+        else:
+            # encode_basestring екранує рядки так само, як json.dumps(..., ensure_ascii=False):
+            # не-ASCII символи пишуться як є, у UTF-8
+            encode = json.encoder.encode_basestring
+            file.writelines(
+                f'{{"name": {encode(name)}, "phone": {encode(phone)}}}\n'
+                for name, phone in contacts.items()
+            )
+    
+    return len(contacts)
+
+
+@input_error
+def import_file(args: Tuple[str, ...], contacts: MutableMapping[str, str]) -> str:
+    """
+    Імпортує контакти з файлу командою бота.
+    
+    Args:
+        args: Кортеж зі шляхом до файлу
+        contacts: Словник контактів
+        
+    Returns:
+        str: Підсумок імпорту
+        
+    Raises:
+        IndexError: Якщо не вказано шлях до файлу
+    """
+    if len(args) < 1:
+        raise IndexError("file path required")
+    
+    return import_contacts(contacts, args[0]).report()
+
+
+@input_error
+def export_file(args: Tuple[str, ...], contacts: MutableMapping[str, str]) -> str:
+    """
+    Експортує контакти у файл командою бота.
+    
+    Args:
+        args: Кортеж зі шляхом до файлу
+        contacts: Словник контактів
+        
+    Returns:
+        str: Повідомлення про результат операції
+        
+    Raises:
+        IndexError: Якщо не вказано шлях до файлу
+    """
+    if len(args) < 1:
+        raise IndexError("file path required")
+    
+    count = export_contacts(contacts, args[0])
+    return f"Exported {count} contact(s) to '{args[0]}'."
+
+
 # -------------------- Допоміжні функції --------------------
 
-def show_help() -> str:
+def show_stats(args: Tuple[str, ...]) -> str:
+    """
+    Показує метрики команд: таблицею або у форматі JSON (stats json).
+    
+    Args:
+        args: Кортеж з необов'язковим форматом "json"
+        
+    Returns:
+        str: Метрики команд
+    """
+    if _active_metrics is None:
+        return "Metrics are disabled. Start the bot with --metrics."
+    if args and args[0].lower() == "json":
+        return json.dumps(_active_metrics.snapshot(), indent=2)
+    return _active_metrics.report()
+
+
+def show_help(allow_files: bool = True) -> str:
     """
     Показує довідку по доступних командах.
     
+    Args:
+        allow_files (bool): Чи доступні команди import та export
+        
     Returns:
         str: Текст довідки
     """
-    help_text = """
+    file_commands = """
+  import <file>             - Import contacts from .csv or .jsonl
+  export <file>             - Export contacts to .csv or .jsonl""" if allow_files else ""
+    file_examples = """
+  import contacts.csv
+  export backup.jsonl""" if allow_files else ""
+    
+    help_text = f"""
 Available commands:
   hello                     - Greeting
   add <name> <phone>        - Add new contact
@@ -289,7 +1290,9 @@ Available commands:
   phone <name>              - Show phone for contact
   delete <name>             - Delete contact
   search <query>            - Search contacts by name or phone
-  all                       - Show all contacts
+  whois <phone>             - Find contacts by phone number in any format
+  all [offset] [limit]      - Show contacts sorted by name, optionally one page{file_commands}
+  stats [json]              - Show per-command metrics (with --metrics)
   help                      - Show this help
   close, exit               - Exit the program
 
@@ -299,31 +1302,103 @@ Examples:
   phone John
   delete John
   search 050
+  whois +380501234567
   all
+  all 20 10{file_examples}
 """
     return help_text.strip()
 
 
 # -------------------- Головний цикл програми --------------------
 
-def main() -> None:
-    """
-    Головна функція бота - запускає інтерактивний цикл.
+# Команди завершення роботи
+EXIT_COMMANDS = ("close", "exit", "quit", "bye")
+
+# Розмір буфера для пакетного читання команд та запису результатів
+BATCH_BUFFER_SIZE = 1 << 20
+
+
+def build_command_handlers(contacts: MutableMapping[str, str], out: TextIO,
+                           allow_files: bool = True,
+                           page_limit: Optional[int] = None) -> Dict[str, Callable[..., str]]:
     """
-    contacts: Dict[str, str] = {}
-    print("Welcome to the assistant bot!")
-    print("Type 'help' to see available commands.")
+    Створює командну мапу над адресною книгою.
     
+    Args:
+        contacts: Книга контактів
+        out: Потік, у який потокові команди (all) пишуть результат
+        allow_files: Чи додавати команди import та export, що читають і пишуть
+            файли на машині бота (вимкнено для мережевих клієнтів)
+        page_limit: Найбільша кількість контактів у відповіді all та search
+            або None (без обмеження)
+        
+    Returns:
+        Dict[str, Callable[..., str]]: Команда -> обробник
+    """
     # Командна мапа для легкого розширення
     command_handlers = {
         "add": lambda args: add_contact(args, contacts),
         "change": lambda args: change_contact(args, contacts),
         "phone": lambda args: show_phone(args, contacts),
         "delete": lambda args: delete_contact(args, contacts),
-        "search": lambda args: search_contacts(args, contacts),
-        "all": lambda: show_all(contacts),
-        "help": lambda: show_help()
+        "search": lambda args: search_contacts(args, contacts, page_limit),
+        "whois": lambda args: whois(args, contacts),
+        "all": lambda args: show_all(args, contacts, out, page_limit),
+        "help": lambda: show_help(allow_files)
     }
+    if allow_files:
+        command_handlers["import"] = lambda args: import_file(args, contacts)
+        command_handlers["export"] = lambda args: export_file(args, contacts)
+    
+    # Вимір затримок додається лише коли метрики ввімкнені
+    metrics = _active_metrics
+    if metrics is not None:
+        command_handlers = {command: _timed(command, handler, metrics)
+                            for command, handler in command_handlers.items()}
+    command_handlers["stats"] = lambda args: show_stats(args)
+    return command_handlers
+
+
+def execute_command(command: str, args: List[str],
+                    command_handlers: Dict[str, Callable[..., str]]) -> str:
+    """
+    Виконує одну команду, крім команд завершення роботи.
+    
+    Args:
+        command: Назва команди
+        args: Аргументи команди
+        command_handlers: Командна мапа
+        
+    Returns:
+        str: Результат команди; порожній, якщо результат уже записано в потік
+    """
+    # Привітання
+    if command == "hello":
+        return "How can I help you?"
+    
+    # Обробляємо команди через мапу
+    if command in command_handlers:
+        handler = command_handlers[command]
+        # Перевіряємо, чи функція потребує аргументів
+        if command == "help":
+            return handler()
+        return handler(tuple(args))
+    
+    # Невідома команда
+    return f"Invalid command: '{command}'. Type 'help' for available commands."
+
+
+def run_bot(contacts: MutableMapping[str, str]) -> None:
+    """
+    Запускає інтерактивний цикл бота над адресною книгою.
+    
+    Args:
+        contacts: Книга контактів
+    """
+    print("Welcome to the assistant bot!")
+    print("Type 'help' to see available commands.")
+    
+    command_handlers = build_command_handlers(contacts, sys.stdout)
     
     while True:
         try:
@@ -335,27 +1410,14 @@ def main() -> None:
             command, *args = parse_input(user_input)
             
             # Команди виходу
-            if command in ("close", "exit", "quit", "bye"):
+            if command in EXIT_COMMANDS:
                 print("Good bye!")
                 break
             
-            # Привітання
-            elif command == "hello":
-                print("How can I help you?")
-            
-            # Обробляємо команди через мапу
-            elif command in command_handlers:
-                handler = command_handlers[command]
-                # Перевіряємо, чи функція потребує аргументів
-                if command in ("all", "help"):
-                    result = handler()
-                else:
-                    result = handler(tuple(args))
+            result = execute_command(command, args, command_handlers)
+            # Потокові команди вже вивели результат самостійно
+            if result:
                 print(result)
-            
-            # Невідома команда
-            else:
-                print(f"Invalid command: '{command}'. Type 'help' for available commands.")
                 
         except KeyboardInterrupt:
             print("\nProgram interrupted by user. Good bye!")
@@ -367,5 +1429,130 @@ def main() -> None:
             print(f"Unexpected error: {e}")
 
 
+def run_batch(contacts: MutableMapping[str, str], source: TextIO, out: TextIO) -> None:
+    """
+    Виконує команди з файлу або stdin без запрошень та привітань.
+    
+    Команди обробляються тією ж командною мапою та декоратором input_error,
+    що й в інтерактивному режимі; у out пишуться лише результати команд.
+    Обробка зупиняється на команді завершення або в кінці вводу.
+    
+    Args:
+        contacts: Книга контактів
+        source: Потік з командами, по одній на рядок
+        out: Буферизований потік для результатів
+    """
+    command_handlers = build_command_handlers(contacts, out)
+    write = out.write
+    
+    for line in source:
+        user_input = line.strip()
+        if not user_input:
+            continue
+        
+        command, *args = parse_input(user_input)
+        if command in EXIT_COMMANDS:
+            break
+        
+        try:
+            result = execute_command(command, args, command_handlers)
+        except Exception as e:
+            result = f"Unexpected error: {e}"
+        if result:
+            write(result)
+            write("\n")
+
+
+def main() -> None:
+    """
+    Головна функція бота - обробляє аргументи та запускає інтерактивний
+    або пакетний режим.
+    """
+    parser = argparse.ArgumentParser(description="Консольний бот-помічник")
+    parser.add_argument(
+        "--data",
+        metavar="DIR",
+        help="Каталог для збереження контактів між запусками (журнал та знімки)"
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Виконати команди з файлу ('-' - зі stdin) без інтерактивних запрошень"
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="Файл для результатів пакетного режиму (за замовчуванням stdout)"
+    )
+    parser.add_argument(
+        "--store",
+        choices=("book", "compact"),
+        default="book",
+        help="Сховище контактів: book - з індексами пошуку, "
+             "compact - мінімум пам'яті, пошук повним переглядом"
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Збирати метрики команд (кількість, помилки, затримки) для команди stats"
+    )
+    parser.add_argument(
+        "--metrics-dump",
+        metavar="FILE",
+        help="Записати метрики у JSON-файл при завершенні (вмикає --metrics)"
+    )
+    args = parser.parse_args()
+    
+    if args.metrics or args.metrics_dump:
+        enable_metrics()
+    
+    if args.store == "compact":
+        from compact import CompactContactStore
+        
+        contacts: MutableMapping[str, str] = CompactContactStore()
+    else:
+        contacts = ContactBook()
+    journal = None
+    if args.data is not None:
+        from storage import ContactJournal
+        
+        journal = ContactJournal(args.data)
+        journal.open(contacts)
+    
+    try:
+        if args.batch is None:
+            run_bot(contacts)
+        else:
+            _run_batch_files(contacts, args.batch, args.output)
+    finally:
+        if journal is not None:
+            journal.close()
+        if args.metrics_dump and _active_metrics is not None:
+            with open(args.metrics_dump, "w", encoding="utf-8") as file:
+                json.dump(_active_metrics.snapshot(), file, indent=2)
+
+
+def _run_batch_files(contacts: MutableMapping[str, str], batch: str,
+                     output: Optional[str]) -> None:
+    """
+    Відкриває потоки пакетного режиму з великими буферами та виконує команди.
+    """
+    with contextlib.ExitStack() as stack:
+        if batch == "-":
+            source = sys.stdin
+        else:
+            source = stack.enter_context(
+                open(batch, "r", encoding="utf-8", buffering=BATCH_BUFFER_SIZE))
+        if output is None:
+            sys.stdout.flush()
+            out = stack.enter_context(
+                open(sys.stdout.fileno(), "w", encoding="utf-8",
+                     buffering=BATCH_BUFFER_SIZE, closefd=False))
+        else:
+            out = stack.enter_context(
+                open(output, "w", encoding="utf-8", buffering=BATCH_BUFFER_SIZE))
+        run_batch(contacts, source, out)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Тести компактного сховища контактів (compact.CompactContactStore).
+
+Запуск:
+    python -m unittest test_compact
+"""
+
+import random
+import unittest
+
+from compact import COMPACT_MIN_GARBAGE, CompactContactStore
+from phones import normalize_phone
+
+
+def _random_phone(rng: random.Random) -> str:
+    """Телефон з цифр, з "+", з роздільниками або зовсім без цифр."""
+    kind = rng.randrange(5)
+    if kind == 0:
+        return "+380" + "".join(rng.choices("0123456789", k=9))
+    if kind == 1:
+        return "050-" + "".join(rng.choices("0123", k=3)) + "-45-67"
+    if kind == 2:
+        return "n/a" * rng.randrange(1, 100)
+    if kind == 3:
+        return "".join(rng.choices("0123456789", k=rng.randrange(1, 25)))
+    return "0501234" + rng.choice("0123456789") * 3
+
+
+class CompactContactStoreTest(unittest.TestCase):
+    def assertSameAsDict(self, store: CompactContactStore, expected: dict) -> None:
+        self.assertEqual(len(store), len(expected))
+        self.assertEqual(list(store.items()), list(expected.items()))
+        for name, phone in expected.items():
+            self.assertIn(name, store)
+            self.assertEqual(store[name], phone)
+
+    def test_matches_dict_under_random_changes(self) -> None:
+        rng = random.Random(5)
+        store = CompactContactStore()
+        expected = {}
+        # Довгі імена перевіряють 5-байтовий префікс довжини в арені
+        names = [f"Name{i}" for i in range(3000)] + ["Довге ім'я " * 40 + str(i) for i in range(20)]
+        for step in range(30000):
+            name = rng.choice(names)
+            if name in expected and rng.random() < 0.4:
+                del store[name]
+                del expected[name]
+                self.assertNotIn(name, store)
+                with self.assertRaises(KeyError):
+                    store[name]
+            else:
+                phone = _random_phone(rng)
+                store[name] = phone
+                expected[name] = phone
+            if step % 5000 == 0:
+                self.assertSameAsDict(store, expected)
+        self.assertSameAsDict(store, expected)
+
+        for _ in range(200):
+            phone = _random_phone(rng)
+            key = normalize_phone(phone)
+            owners = [name for name, other in expected.items()
+                      if key and normalize_phone(other) == key]
+            self.assertEqual(store.phone_owners(phone), owners)
+
+    def test_deleting_most_contacts_compacts_slots(self) -> None:
+        store = CompactContactStore()
+        for i in range(5000):
+            store[f"Name{i}"] = f"050{i:07d}"
+        for i in range(4500):
+            del store[f"Name{i}"]
+        self.assertLess(len(store._name_offsets), 5000)
+        self.assertEqual(store.to_dict(), {f"Name{i}": f"050{i:07d}" for i in range(4500, 5000)})
+        self.assertEqual(store.phone_owners("+380500000001"), [])
+        self.assertEqual(store.phone_owners("+380 50 000 4999"), ["Name4999"])
+
+    def test_replaced_arena_phones_are_reclaimed(self) -> None:
+        store = CompactContactStore({"John": "0501234567"})
+        for i in range(20000):
+            store["John"] = f"ext. {i:020d}"
+        self.assertLess(len(store._arena), 4 * COMPACT_MIN_GARBAGE)
+        self.assertEqual(store.to_dict(), {"John": f"ext. {19999:020d}"})
+        self.assertEqual(store.phone_owners(f"{19999:020d}"), ["John"])
+
+    def test_missing_name_raises_key_error(self) -> None:
+        store = CompactContactStore()
+        with self.assertRaises(KeyError):
+            store["John"]
+        with self.assertRaises(KeyError):
+            del store["John"]
+
+
+if __name__ == "__main__":
+    unittest.main()
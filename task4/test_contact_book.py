@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Тести індексів ContactBook: пошук за триграмами та відсортований список
+мають давати ті самі результати, що й повний перегляд словника.
+
+Запуск:
+    python -m unittest test_contact_book
+"""
+
+import random
+import unittest
+
+from task4 import ContactBook, sort_key
+
+
+def _scan_search(contacts: dict, query: str) -> list:
+    """Пошук повним переглядом, як у search_contacts для звичайного словника."""
+    return [(name, phone) for name, phone in contacts.items()
+            if query in name.lower() or query in phone]
+
+
+class ContactBookIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rng = random.Random(3)
+
+    def _random_name(self) -> str:
+        # Мала абетка дає багато спільних триграм і коротких імен
+        return "".join(self.rng.choices("abcABCйЙ", k=self.rng.randrange(1, 7)))
+
+    def _random_phone(self) -> str:
+        return "".join(self.rng.choices("0129+", k=self.rng.randrange(1, 8)))
+
+    def _random_query(self) -> str:
+        return "".join(self.rng.choices("abcй0129", k=self.rng.randrange(1, 6)))
+
+    def assertMatchesScan(self, book: ContactBook, expected: dict) -> None:
+        self.assertEqual(book.to_dict(), expected)
+        for _ in range(40):
+            query = self._random_query()
+            self.assertEqual(book.search(query), _scan_search(expected, query), query)
+        by_key = sorted(expected.items(), key=lambda item: sort_key(item[0]))
+        self.assertEqual([sort_key(name) for name, _ in book.sorted_items()],
+                         [sort_key(name) for name, _ in by_key])
+        self.assertEqual(list(book.sorted_items(5, 10)), list(book.sorted_items())[5:15])
+
+    def test_search_and_sorting_match_scan(self) -> None:
+        book = ContactBook()
+        expected = {}
+        for step in range(4000):
+            name = self._random_name()
+            if name in expected and self.rng.random() < 0.3:
+                del book[name]
+                del expected[name]
+            else:
+                phone = self._random_phone()
+                book[name] = phone
+                expected[name] = phone
+            if step % 500 == 0:
+                self.assertMatchesScan(book, expected)
+        self.assertMatchesScan(book, expected)
+
+    def test_bulk_update_matches_scan(self) -> None:
+        book = ContactBook()
+        expected = {}
+        for _ in range(5):
+            # Великий пакет перебудовує індекси цілком, малий - оновлює поштучно
+            for size in (500, 10):
+                batch = [(self._random_name(), self._random_phone()) for _ in range(size)]
+                book.update(batch)
+                expected.update(batch)
+                self.assertMatchesScan(book, expected)
+            for name in self.rng.sample(sorted(expected), 20):
+                del book[name]
+                del expected[name]
+            self.assertMatchesScan(book, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Тести масового імпорту та експорту контактів (import_contacts, export_contacts).
+
+Запуск:
+    python -m unittest test_import_export
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from compact import CompactContactStore
+from task4 import SUMMARY_SAMPLE_SIZE, ContactBook, export_contacts, import_contacts, import_file
+
+
+# Імена з лапками, комами, зворотними скісними та не-ASCII символами
+AWKWARD_CONTACTS = {
+    'O"Brien': "+380501234567",
+    "back\\slash": "050\\123",
+    "Ім'я": "0671112233",
+    "a,b": "1,2",
+    "emoji\U0001F600": "0",
+    '"quoted"': '"1"',
+}
+
+
+class ImportExportTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._tmp.name, name)
+
+    def _write(self, name: str, text: str) -> str:
+        path = self._path(name)
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write(text)
+        return path
+
+    def test_round_trip_preserves_awkward_values(self) -> None:
+        for suffix in (".csv", ".jsonl"):
+            with self.subTest(suffix=suffix):
+                path = self._path("contacts" + suffix)
+                self.assertEqual(export_contacts(AWKWARD_CONTACTS, path), len(AWKWARD_CONTACTS))
+                restored = {}
+                summary = import_contacts(restored, path)
+                self.assertEqual(summary.imported, len(AWKWARD_CONTACTS))
+                self.assertEqual(summary.invalid, 0)
+                self.assertEqual(list(restored.items()), list(AWKWARD_CONTACTS.items()))
+
+    def test_jsonl_export_matches_json_dumps(self) -> None:
+        path = self._path("contacts.jsonl")
+        export_contacts(AWKWARD_CONTACTS, path)
+        with open(path, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        expected = [json.dumps({"name": name, "phone": phone}, ensure_ascii=False)
+                    for name, phone in AWKWARD_CONTACTS.items()]
+        self.assertEqual(lines, expected)
+
+    def test_csv_header_is_skipped_only_on_first_line(self) -> None:
+        path = self._write("contacts.csv", " Name , PHONE \r\nJohn,050\r\nname,phone\r\n")
+        contacts = {}
+        import_contacts(contacts, path)
+        self.assertEqual(contacts, {"John": "050", "name": "phone"})
+
+        path = self._write("no_header.csv", "John,050\r\n")
+        contacts = {}
+        import_contacts(contacts, path)
+        self.assertEqual(contacts, {"John": "050"})
+
+    def test_invalid_rows_are_reported_by_line(self) -> None:
+        path = self._write("contacts.csv", "\r\n".join([
+            "name,phone",
+            "John,050",
+            "John Smith,050",   # пробіл в імені
+            "Jane,050,extra",   # зайва колонка
+            "",                 # порожній рядок не є помилкою
+            ",050",             # порожнє ім'я
+            "  Bob  , 067 ",    # пробіли по краях обрізаються
+        ]) + "\r\n")
+        contacts = {}
+        summary = import_contacts(contacts, path)
+        self.assertEqual(contacts, {"John": "050", "Bob": "067"})
+        self.assertEqual(summary.invalid_lines, [3, 4, 6])
+
+        path = self._write("contacts.jsonl", "\n".join([
+            '{"name": "John", "phone": "050"}',
+            '{"name": "Jane", "phone": 50}',
+            '["Bob", "067"]',
+            "",
+            "{broken",
+            '{"name": "Ann"}',
+        ]) + "\n")
+        contacts = {}
+        summary = import_contacts(contacts, path)
+        self.assertEqual(contacts, {"John": "050"})
+        self.assertEqual(summary.invalid_lines, [2, 3, 5, 6])
+
+    def test_duplicates_are_skipped_and_sampled(self) -> None:
+        names = [f"Name{i}" for i in range(SUMMARY_SAMPLE_SIZE + 5)]
+        path = self._write("contacts.csv", "".join(f"{name},1{i}\r\n" for i, name in enumerate(names))
+                           + "Name0,999\r\n")
+        contacts = {"Name1": "old"}
+        summary = import_contacts(contacts, path)
+        self.assertEqual(contacts["Name1"], "old")
+        self.assertEqual(contacts["Name0"], "10")
+        self.assertEqual(summary.imported, len(names) - 1)
+        self.assertEqual(summary.duplicates, 2)
+        self.assertEqual(summary.duplicate_names, ["Name1", "Name0"])
+
+        summary.add_duplicates(names)
+        self.assertEqual(len(summary.duplicate_names), SUMMARY_SAMPLE_SIZE)
+        self.assertTrue(summary.report().splitlines()[1].endswith(", ..."))
+
+    def test_shared_phones_are_reported_for_every_store(self) -> None:
+        path = self._write("contacts.csv", "A,050-111-22-33\r\nB,+380501112233\r\nC,n/a\r\nD,n/a\r\n")
+        for factory in (dict, ContactBook, CompactContactStore):
+            with self.subTest(store=factory.__name__):
+                contacts = factory()
+                contacts["Z"] = "0501112233"
+                summary = import_contacts(contacts, path)
+                # Номери без цифр не вважаються спільними
+                self.assertEqual(summary.shared_phone_names, ["A", "B"])
+
+    def test_unsupported_format(self) -> None:
+        path = self._write("contacts.txt", "John,050\n")
+        with self.assertRaises(ValueError):
+            import_contacts({}, path)
+        self.assertEqual(import_file((path,), {}), "Invalid format. Please check your input.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Тести метрик команд (CommandMetrics та обгортка обробників).
+
+Запуск:
+    python -m unittest test_metrics
+"""
+
+import io
+import json
+import unittest
+
+import task4
+from task4 import LATENCY_BUCKETS, CommandMetrics, build_command_handlers, show_stats
+
+
+class CommandMetricsTest(unittest.TestCase):
+    def test_percentiles_are_bucket_upper_bounds(self) -> None:
+        metrics = CommandMetrics()
+        for elapsed_ns in (1, 3, 1000):
+            metrics.record("add", elapsed_ns)
+        # 1 -> кошик 1, 3 -> кошик 2, 1000 -> кошик 10 (верхня межа 1024)
+        self.assertEqual(metrics.histograms["add"][1:3], [1, 1])
+        self.assertEqual(metrics.histograms["add"][10], 1)
+        self.assertEqual(metrics.percentile_ns("add", 0.3), 2)
+        self.assertEqual(metrics.percentile_ns("add", 0.5), 4)
+        # Верхня межа кошика не перевищує найбільшої затримки
+        self.assertEqual(metrics.percentile_ns("add", 0.99), 1000)
+
+    def test_zero_and_huge_latencies(self) -> None:
+        metrics = CommandMetrics()
+        metrics.record("all", 0)
+        metrics.record("all", 1 << 60)
+        histogram = metrics.snapshot()["all"]["histogram"]
+        # Усе довше за 2^(LATENCY_BUCKETS - 1) нс потрапляє в останній кошик
+        self.assertEqual(histogram, {"1": 1, str(1 << (LATENCY_BUCKETS - 1)): 1})
+        self.assertEqual(metrics.max_ns["all"], 1 << 60)
+        self.assertEqual(metrics.percentile_ns("all", 0.5), 1)
+        self.assertEqual(metrics.percentile_ns("all", 1.0), 1 << (LATENCY_BUCKETS - 1))
+
+    def test_snapshot_and_report(self) -> None:
+        metrics = CommandMetrics()
+        self.assertEqual(metrics.snapshot(), {})
+        self.assertEqual(metrics.report(), "No commands recorded yet.")
+
+        metrics.record("phone", 1500)
+        metrics.pending_error = "KeyError"
+        metrics.record("phone", 2_500_000)
+        metrics.record("add", 500)
+        snapshot = metrics.snapshot()
+        self.assertEqual(list(snapshot), ["add", "phone"])
+        self.assertEqual(snapshot["phone"], {
+            "calls": 2,
+            "errors": {"KeyError": 1},
+            "total_ns": 2_501_500,
+            "max_ns": 2_500_000,
+            "p50_ns": 2048,
+            "p99_ns": 2_500_000,
+            "histogram": {"2048": 1, str(1 << 22): 1},
+        })
+        json.dumps(snapshot)
+
+        lines = metrics.report().splitlines()
+        self.assertEqual(lines[0].split(), ["Command", "Calls", "Errors", "Mean", "p50", "p99", "Max"])
+        self.assertEqual(lines[1].split(), ["add", "1", "0", "500", "ns", "500", "ns", "500", "ns", "500", "ns"])
+        self.assertEqual(lines[2].split(), ["phone", "2", "1", "1.3", "ms", "2.0", "us", "2.5", "ms", "2.5", "ms"])
+        self.assertEqual(lines[3], "  KeyError: 1")
+
+
+class TimedHandlersTest(unittest.TestCase):
+    def setUp(self) -> None:
+        previous = task4._active_metrics
+        self.addCleanup(setattr, task4, "_active_metrics", previous)
+        task4._active_metrics = None
+        self.contacts = {}
+
+    def _handlers(self):
+        return build_command_handlers(self.contacts, io.StringIO())
+
+    def test_errors_are_attributed_to_their_command(self) -> None:
+        metrics = task4.enable_metrics()
+        handlers = self._handlers()
+        self.assertEqual(handlers["add"](("John", "0501234567")), "Contact added.")
+        self.assertEqual(handlers["phone"](("Jane",)), "Contact 'Jane' not found.")
+        self.assertEqual(handlers["whois"](()), "Enter the argument for the command")
+        handlers["phone"](("John",))
+        handlers["help"]()
+
+        self.assertEqual(metrics.calls, {"add": 1, "phone": 2, "whois": 1, "help": 1})
+        self.assertEqual(metrics.errors, {"phone": {"KeyError": 1}, "whois": {"IndexError": 1}})
+        self.assertIsNone(metrics.pending_error)
+        self.assertIn("phone", show_stats(()))
+        self.assertEqual(json.loads(show_stats(("json",)))["whois"]["errors"], {"IndexError": 1})
+
+    def test_stale_pending_error_is_not_attributed(self) -> None:
+        metrics = task4.enable_metrics()
+        handlers = self._handlers()
+        # Помилка, перехоплена поза обгорнутим обробником
+        metrics.pending_error = "ValueError"
+        handlers["add"](("John", "0501234567"))
+        self.assertEqual(metrics.errors, {})
+
+    def test_disabled_metrics(self) -> None:
+        handlers = self._handlers()
+        self.assertEqual(handlers["phone"](("Jane",)), "Contact 'Jane' not found.")
+        self.assertIsNone(task4._active_metrics)
+        self.assertEqual(show_stats(()), "Metrics are disabled. Start the bot with --metrics.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Тести нормалізації телефонів та пошуку за номером (normalize_phone, whois).
+
+Запуск:
+    python -m unittest test_phones
+"""
+
+import unittest
+
+from compact import CompactContactStore
+from phones import DEFAULT_COUNTRY_CODE, normalize_phone
+from task4 import ContactBook, add_contact, change_contact, delete_contact, whois
+
+
+class NormalizePhoneTest(unittest.TestCase):
+    def test_formats_of_one_number_agree(self) -> None:
+        expected = DEFAULT_COUNTRY_CODE + "501234567"
+        for phone in ("0501234567", "050-123-45-67", "(050) 123 45 67", "+380 50 123 4567",
+                      "380501234567", "00380501234567", " +380501234567 "):
+            with self.subTest(phone=phone):
+                self.assertEqual(normalize_phone(phone), expected)
+
+    def test_international_prefix(self) -> None:
+        self.assertEqual(normalize_phone("0044 20 7946 0958"), "442079460958")
+        self.assertEqual(normalize_phone("+44 20 7946 0958"), "442079460958")
+        # 00 прибирається раніше, ніж діє національний префікс
+        self.assertEqual(normalize_phone("0012"), "12")
+
+    def test_trunk_prefix_is_not_applied_to_international_numbers(self) -> None:
+        self.assertEqual(normalize_phone("+0501234567"), "0501234567")
+        self.assertEqual(normalize_phone("12345"), "12345")
+
+    def test_numbers_without_ascii_digits(self) -> None:
+        self.assertEqual(normalize_phone("n/a"), "")
+        self.assertEqual(normalize_phone(""), "")
+        # Цифри інших писемностей не вважаються цифрами номера
+        self.assertEqual(normalize_phone("٠٥٠"), "")
+
+
+class WhoisTest(unittest.TestCase):
+    STORES = (dict, ContactBook, CompactContactStore)
+
+    def test_lookup_in_any_format(self) -> None:
+        for factory in self.STORES:
+            with self.subTest(store=factory.__name__):
+                contacts = factory()
+                add_contact(("John", "050-123-45-67"), contacts)
+                add_contact(("Jane", "+380501234567"), contacts)
+                add_contact(("Bob", "0671112233"), contacts)
+                self.assertEqual(whois(("00380501234567",), contacts),
+                                 "John: 050-123-45-67\nJane: +380501234567")
+                self.assertEqual(whois(("0990000000",), contacts),
+                                 "No contacts found with phone '0990000000'")
+
+    def test_index_follows_changes_and_deletes(self) -> None:
+        for factory in self.STORES:
+            with self.subTest(store=factory.__name__):
+                contacts = factory()
+                add_contact(("John", "0501234567"), contacts)
+                add_contact(("Jane", "0671112233"), contacts)
+                change_contact(("John", "0671112233"), contacts)
+                self.assertEqual(whois(("0501234567",), contacts),
+                                 "No contacts found with phone '0501234567'")
+                delete_contact(("Jane",), contacts)
+                self.assertEqual(whois(("+380671112233",), contacts), "John: 0671112233")
+
+    def test_shared_phone_warning(self) -> None:
+        for factory in self.STORES:
+            with self.subTest(store=factory.__name__):
+                contacts = factory()
+                self.assertEqual(add_contact(("John", "0501234567"), contacts), "Contact added.")
+                self.assertEqual(add_contact(("Jane", "+380501234567"), contacts),
+                                 "Contact added.\nWarning: phone +380501234567 is also used by John.")
+                # Номер без цифр ні з ким не збігається
+                self.assertEqual(add_contact(("Bob", "n/a"), contacts), "Contact added.")
+                self.assertEqual(add_contact(("Ann", "n/a"), contacts), "Contact added.")
+                # Власний номер контакту не вважається спільним
+                self.assertEqual(change_contact(("John", "050 123 45 67"), contacts),
+                                 "Contact 'John' updated from 0501234567 to 050 123 45 67."
+                                 "\nWarning: phone 050 123 45 67 is also used by Jane.")
+
+    def test_missing_argument(self) -> None:
+        self.assertEqual(whois((), {}), "Enter the argument for the command")
+
+
+if __name__ == "__main__":
+    unittest.main()
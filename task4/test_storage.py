@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Тести відновлення адресної книги з журналу (storage.ContactJournal).
+
+Запуск:
+    python -m unittest test_storage
+"""
+
+import json
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from compact import CompactContactStore
+from storage import SNAPSHOT_NAME, ContactJournal, _journal_name
+from task4 import ContactBook
+
+
+class ContactJournalTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _open(self, factory=ContactBook, **kwargs) -> ContactBook:
+        """Відкриває нову книгу з журналу каталогу, як після перезапуску."""
+        contacts = factory()
+        journal = ContactJournal(self.directory, **kwargs)
+        journal.open(contacts)
+        self.addCleanup(journal.close)
+        return contacts
+
+    def _journal_files(self):
+        return sorted(entry for entry in os.listdir(self.directory) if entry.startswith("journal-"))
+
+    def test_changes_survive_restart(self) -> None:
+        contacts = self._open()
+        contacts["John"] = "0501234567"
+        contacts["Jane"] = "0671234567"
+        contacts["John"] = "0509999999"
+        del contacts["Jane"]
+        contacts.journal.close()
+
+        self.assertEqual(self._open().to_dict(), {"John": "0509999999"})
+
+    def test_torn_tail_is_truncated(self) -> None:
+        contacts = self._open()
+        contacts["John"] = "0501234567"
+        contacts.journal.close()
+
+        path = os.path.join(self.directory, self._journal_files()[-1])
+        intact_size = os.path.getsize(path)
+        with open(path, "ab") as file:
+            file.write(b'["set", "Jane", "06712')
+
+        self.assertEqual(self._open().to_dict(), {"John": "0501234567"})
+        self.assertEqual(os.path.getsize(path), intact_size)
+
+    def test_corrupted_older_journal_is_rejected(self) -> None:
+        with open(os.path.join(self.directory, _journal_name(0)), "w", encoding="utf-8") as file:
+            file.write('["set", "John"\n')
+        with open(os.path.join(self.directory, _journal_name(1)), "w", encoding="utf-8") as file:
+            file.write('["set", "Jane", "0671234567"]\n')
+
+        with self.assertRaises(ValueError):
+            ContactJournal(self.directory).open(ContactBook())
+
+    def test_rotation_writes_snapshot_and_drops_old_journals(self) -> None:
+        contacts = self._open(batch_size=4, compact_threshold=10)
+        for i in range(35):
+            contacts[f"Name{i}"] = f"050{i:07d}"
+        del contacts["Name3"]
+        expected = contacts.to_dict()
+        contacts.journal.close()
+
+        with open(os.path.join(self.directory, SNAPSHOT_NAME), encoding="utf-8") as file:
+            generation = json.loads(file.readline())["generation"]
+        self.assertEqual(self._journal_files(), [_journal_name(generation)])
+        self.assertEqual(self._open().to_dict(), expected)
+
+    def test_stale_journals_before_snapshot_are_removed(self) -> None:
+        # Збій між записом знімка та видаленням покритих ним журналів
+        with open(os.path.join(self.directory, SNAPSHOT_NAME), "w", encoding="utf-8") as file:
+            file.write('{"generation": 2}\n["John", "0501234567"]\n')
+        with open(os.path.join(self.directory, _journal_name(1)), "w", encoding="utf-8") as file:
+            file.write('["set", "Old", "0000000000"]\n')
+        with open(os.path.join(self.directory, _journal_name(2)), "w", encoding="utf-8") as file:
+            file.write('["set", "Jane", "0671234567"]\n')
+
+        contacts = self._open()
+        self.assertEqual(contacts.to_dict(), {"John": "0501234567", "Jane": "0671234567"})
+        self.assertEqual(self._journal_files(), [_journal_name(2)])
+
+    def test_replay_matches_live_book(self) -> None:
+        rng = random.Random(1)
+        contacts = self._open(batch_size=16, compact_threshold=500)
+        names = [f"Name{i}" for i in range(200)]
+        for _ in range(3000):
+            name = rng.choice(names)
+            if name in contacts and rng.random() < 0.3:
+                del contacts[name]
+            else:
+                contacts[name] = f"0{rng.randrange(10 ** 9):09d}"
+        expected = contacts.to_dict()
+        expected_sorted = list(contacts.sorted_items())
+        contacts.journal.close()
+
+        restored = self._open()
+        self.assertEqual(restored.to_dict(), expected)
+        self.assertEqual(list(restored.sorted_items()), expected_sorted)
+        self.assertEqual(restored.search("name1"), [(name, phone) for name, phone in expected.items()
+                                                     if "name1" in name.lower()])
+
+    def test_bulk_add_is_journaled_as_one_batch(self) -> None:
+        contacts = self._open(batch_size=4, compact_threshold=100)
+        contacts["John"] = "0501234567"
+        pairs = [(f"Name{i}", f"050{i:07d}") for i in range(250)] + [("John", "0")]
+        duplicates, _ = contacts.add_many(pairs)
+        self.assertEqual(duplicates, ["John"])
+        expected = contacts.to_dict()
+        contacts.journal.close()
+
+        # Компактування запускається лише після всього пакета
+        with open(os.path.join(self.directory, SNAPSHOT_NAME), encoding="utf-8") as file:
+            self.assertEqual(sum(1 for _ in file) - 1, len(expected))
+        self.assertEqual(self._open().to_dict(), expected)
+
+    def test_compact_store_round_trip(self) -> None:
+        contacts = self._open(CompactContactStore, compact_threshold=50)
+        for i in range(300):
+            contacts[f"Ім'я \"{i}\""] = f"050{i:07d}" if i % 3 else f"ext. {i}\\"
+        for i in range(0, 300, 7):
+            del contacts[f"Ім'я \"{i}\""]
+        expected = contacts.to_dict()
+        contacts.journal.close()
+        self.assertTrue(os.path.exists(os.path.join(self.directory, SNAPSHOT_NAME)))
+
+        restored = self._open(CompactContactStore)
+        self.assertIsInstance(restored, CompactContactStore)
+        self.assertEqual(list(restored.items()), list(expected.items()))
+
+    def test_idle_batch_is_synced(self) -> None:
+        contacts = self._open(batch_size=1000, batch_interval=0.05)
+        contacts["John"] = "0501234567"
+        path = os.path.join(self.directory, self._journal_files()[-1])
+        for _ in range(100):
+            if os.path.getsize(path):
+                break
+            time.sleep(0.02)
+        with open(path, encoding="utf-8") as file:
+            self.assertEqual(file.read(), '["set", "John", "0501234567"]\n')
+
+
+if __name__ == "__main__":
+    unittest.main()